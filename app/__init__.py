@@ -1,20 +1,76 @@
 import os
 import logging
-from flask import Flask, request, jsonify
+import orjson
+from flask import Flask, request, jsonify, g
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from flask_migrate import Migrate
 from flask_socketio import SocketIO
+from sqlalchemy import event
 from config import config
 
+class RoutingSession(Session):
+    """Session that sends reads from @read_replica handlers to the 'replica' bind, if configured"""
+    
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and g and g.get('db_read_only'):
+            replica = self._db.engines.get('replica')
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _sqlite_foreign_keys(dbapi_connection, connection_record):
+    """SQLite leaves foreign keys, and so ON DELETE rules, off unless each connection asks"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
 # Initialize extensions
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 jwt = JWTManager()
 migrate = Migrate()
 socketio = SocketIO(cors_allowed_origins="*")
 
 
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider backed by orjson. Keys are sorted and datetimes go through
+    Flask's default as before, but output differs from Flask's provider:
+    non-ASCII text is written as UTF-8 rather than \\u escapes, dumps() has
+    no spaces after separators, and NaN and Infinity become null.
+    """
+    
+    option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    
+    def dumps(self, obj, **kwargs):
+        # Explicit json.dumps arguments (indent, separators, ...) keep the stdlib path
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self.option).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        option = self.option | orjson.OPT_APPEND_NEWLINE
+        
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=option),
+            mimetype=self.mimetype
+        )
+
+
 def create_app(config_name=None):
     """Application factory pattern"""
     if config_name is None:
@@ -22,9 +78,14 @@ def create_app(config_name=None):
     
     app = Flask(__name__)
     app.config.from_object(config[config_name])
+    app.json = ORJSONProvider(app)
     
     # Initialize extensions
     db.init_app(app)
+    with app.app_context():
+        # Apply the schema's ON DELETE rules on SQLite as PostgreSQL does
+        if db.engine.dialect.name == 'sqlite':
+            event.listen(db.engine, 'connect', _sqlite_foreign_keys)
     jwt.init_app(app)
     migrate.init_app(app, db)
     socketio.init_app(app)
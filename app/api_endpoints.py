@@ -0,0 +1,241 @@
+# api_endpoints.py
+"""
+Endpoint catalogue: the single source for the interactive docs page
+(rendered by app.build_docs) and the /api-test endpoint listing.
+"""
+
+ENDPOINTS = [
+    {
+        'method': 'GET',
+        'path': '/health',
+        'description': 'Health check endpoint to verify API status',
+        'category': 'System',
+        'requires_auth': False,
+        'example_response': {
+            'success': True,
+            'status': 'healthy',
+            'database': 'connected'
+        }
+    },
+    {
+        'method': 'POST',
+        'path': '/auth/register',
+        'description': 'Register a new user account',
+        'category': 'Authentication',
+        'requires_auth': False,
+        'example_body': {
+            'username': 'john_doe',
+            'fullname': 'John Doe',
+            'email': 'john@example.com',
+            'password': 'SecurePass123!',
+            'phone_num': '+1234567890',
+            'location': 'New York, NY',
+            'role': 'user'
+        }
+    },
+    {
+        'method': 'POST',
+        'path': '/auth/login',
+        'description': 'Authenticate user and get access tokens',
+        'category': 'Authentication',
+        'requires_auth': False,
+        'example_body': {
+            'email': 'john@example.com',
+            'password': 'SecurePass123!'
+        }
+    },
+    {
+        'method': 'POST',
+        'path': '/auth/admin/login',
+        'description': 'Authenticate an admin and get access tokens',
+        'category': 'Authentication',
+        'requires_auth': False,
+        'example_body': {
+            'username': 'admin',
+            'password': 'admin123'
+        }
+    },
+    {
+        'method': 'POST',
+        'path': '/auth/hospital/login',
+        'description': 'Authenticate a hospital account and get access tokens',
+        'category': 'Authentication',
+        'requires_auth': False,
+        'example_body': {
+            'username': 'city_hospital',
+            'password': 'SecurePass123!'
+        }
+    },
+    {
+        'method': 'GET',
+        'path': '/auth/profile',
+        'description': 'Get current user profile information',
+        'category': 'Authentication',
+        'requires_auth': True
+    },
+    {
+        'method': 'GET',
+        'path': '/hospital/all',
+        'description': 'Get list of all registered hospitals',
+        'category': 'Hospitals',
+        'requires_auth': False,
+        'query_params': ['page', 'per_page', 'cursor', 'type', 'location']
+    },
+    {
+        'method': 'POST',
+        'path': '/hospital/register',
+        'description': 'Register a new hospital in the system',
+        'category': 'Hospitals',
+        'requires_auth': False,
+        'example_body': {
+            'username': 'city_hospital',
+            'name': 'City General Hospital',
+            'type': 'General',
+            'email': 'admin@cityhospital.com',
+            'password': 'SecurePass123!',
+            'location': '123 Main St, City, State',
+            'reg_id': 'REG123456',
+            'is_multi_level': True
+        }
+    },
+    {
+        'method': 'GET',
+        'path': '/hospital/{id}',
+        'description': 'Get detailed hospital information by ID',
+        'category': 'Hospitals',
+        'requires_auth': False,
+        'path_params': ['id']
+    },
+    {
+        'method': 'PUT',
+        'path': '/hospital/update/{id}',
+        'description': 'Update hospital details',
+        'category': 'Hospitals',
+        'requires_auth': True,
+        'path_params': ['id'],
+        'example_body': {
+            'name': 'City General Hospital',
+            'location': '123 Main St, City, State',
+            'contact_num': '+1234567890'
+        }
+    },
+    {
+        'method': 'POST',
+        'path': '/appointment/opd/book',
+        'description': 'Book an OPD appointment with a doctor',
+        'category': 'Appointments',
+        'requires_auth': True,
+        'example_body': {
+            'slot_id': 1,
+            'symptoms': 'Fever, headache',
+            'notes': 'Patient prefers morning appointment'
+        }
+    },
+    {
+        'method': 'GET',
+        'path': '/appointment/my-appointments',
+        'description': 'Get all appointments for current user',
+        'category': 'Appointments',
+        'requires_auth': True,
+        'query_params': ['status']
+    },
+    {
+        'method': 'GET',
+        'path': '/appointment/available-slots',
+        'description': 'List available OPD slots',
+        'category': 'Appointments',
+        'requires_auth': False,
+        'query_params': ['hospital_id', 'doctor_id', 'department', 'date']
+    },
+    {
+        'method': 'POST',
+        'path': '/bloodbank/register',
+        'description': 'Register a new blood bank',
+        'category': 'Blood Bank',
+        'requires_auth': False,
+        'example_body': {
+            'name': 'City Blood Bank',
+            'location': '456 Health Ave, City, State',
+            'contact_num': '+1234567890',
+            'email': 'info@bloodbank.com'
+        }
+    },
+    {
+        'method': 'POST',
+        'path': '/bloodbank/request',
+        'description': 'Request blood from blood bank',
+        'category': 'Blood Bank',
+        'requires_auth': True,
+        'example_body': {
+            'blood_type': 'O+',
+            'quantity': 2,
+            'urgency': 'high',
+            'reason': 'Surgery requirement'
+        }
+    },
+    {
+        'method': 'GET',
+        'path': '/bloodbank/all',
+        'description': 'List registered blood banks',
+        'category': 'Blood Bank',
+        'requires_auth': False,
+        'query_params': ['page', 'per_page', 'location', 'blood_type']
+    },
+    {
+        'method': 'POST',
+        'path': '/emergency/call',
+        'description': 'Log emergency call and request ambulance',
+        'category': 'Emergency',
+        'requires_auth': True,
+        'example_body': {
+            'location': '789 Emergency St, City, State',
+            'emergency_type': 'Accident',
+            'severity': 'high',
+            'description': 'Car accident with injuries',
+            'patient_count': 2
+        }
+    },
+    {
+        'method': 'GET',
+        'path': '/emergency/all',
+        'description': 'List emergency cases (admin only)',
+        'category': 'Emergency',
+        'requires_auth': True,
+        'query_params': ['page', 'per_page', 'cursor', 'type', 'status']
+    },
+    {
+        'method': 'GET',
+        'path': '/emergency/ambulances/available',
+        'description': 'List available ambulances',
+        'category': 'Emergency',
+        'requires_auth': False,
+        'query_params': ['hospital_id', 'type']
+    },
+    {
+        'method': 'GET',
+        'path': '/admin/dashboard/stats',
+        'description': 'Get system statistics for admin dashboard',
+        'category': 'Admin',
+        'requires_auth': True
+    },
+    {
+        'method': 'POST',
+        'path': '/admin/create',
+        'description': 'Create a new admin user',
+        'category': 'Admin',
+        'requires_auth': True,
+        'example_body': {
+            'username': 'new_admin',
+            'password': 'SecurePass123!',
+            'role': 'admin'
+        }
+    },
+    {
+        'method': 'GET',
+        'path': '/admin/logs',
+        'description': 'Get admin activity logs',
+        'category': 'Admin',
+        'requires_auth': True,
+        'query_params': ['page', 'per_page']
+    }
+]
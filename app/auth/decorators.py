@@ -23,7 +23,6 @@ def role_required(*allowed_roles):
         def decorated(*args, **kwargs):
             try:
                 verify_jwt_in_request()
-                current_user_id = get_jwt_identity()
                 
                 # Get additional claims from token
                 claims = get_jwt()
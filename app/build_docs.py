@@ -0,0 +1,180 @@
+# build_docs.py
+"""
+Build the static API documentation page.
+
+Writes the page, its content-hashed CSS/JS assets and their precompressed
+variants to app/static/dist so the docs route can serve them straight
+from disk:
+
+    python -m app.build_docs
+"""
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+
+from jinja2 import Environment, FileSystemLoader
+from markupsafe import Markup
+
+from app.api_endpoints import ENDPOINTS
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip covers every browser
+    brotli = None
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_DIR = os.path.join(APP_DIR, 'templates')
+SOURCE_PATH = os.path.join(TEMPLATE_DIR, 'api_docs.html')
+ASSET_DIR = os.path.join(APP_DIR, 'static', 'docs')
+DIST_DIR = os.path.join(APP_DIR, 'static', 'dist')
+DOCS_FILENAME = 'api-docs.html'
+ASSET_URL_PREFIX = '/api-docs/assets/'
+
+# Third-party stylesheets; only the Font Awesome core and solid style are used
+CDN_STYLES = (
+    'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/fontawesome.min.css',
+    'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/solid.min.css',
+    'https://cdnjs.cloudflare.com/ajax/libs/prism/1.24.1/themes/prism.min.css',
+)
+
+# Syntax highlighting, loaded by the page script only when an example is first shown
+PRISM_SCRIPTS = (
+    'https://cdnjs.cloudflare.com/ajax/libs/prism/1.24.1/components/prism-core.min.js',
+    'https://cdnjs.cloudflare.com/ajax/libs/prism/1.24.1/components/prism-http.min.js',
+    'https://cdnjs.cloudflare.com/ajax/libs/prism/1.24.1/components/prism-json.min.js',
+)
+
+
+_HTML_COMMENT = re.compile(r'<!--.*?-->', re.S)
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,])\s*')
+_INLINE_BLOCK = re.compile(r'(<(style|script|pre|textarea)\b[^>]*>)(.*?)(</\2>)', re.S)
+
+
+def _minify_css(css):
+    css = _CSS_COMMENT.sub('', css)
+    css = _CSS_PUNCTUATION.sub(r'\1', ' '.join(css.split()))
+    return css.replace(';}', '}')
+
+
+def _minify_js(js):
+    # Line-based on purpose: newlines stay so ASI and template literals are untouched
+    lines = (line.strip() for line in js.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//'))
+
+
+def _minify_html(html):
+    lines = (line.strip() for line in _HTML_COMMENT.sub('', html).splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def minify(html):
+    """
+    Conservative whitespace/comment minifier for the docs page.
+    Inline <style> and <script> bodies are minified separately and
+    whitespace-sensitive <pre>/<textarea> bodies are kept verbatim, so the
+    HTML pass never rewrites them.
+    """
+    blocks = []
+
+    def stash(match):
+        open_tag, tag, body, close_tag = match.groups()
+        if tag == 'style':
+            body = _minify_css(body)
+        elif tag == 'script':
+            body = _minify_js(body)
+        blocks.append(open_tag + body + close_tag)
+        return f'\x00{len(blocks) - 1}\x00'
+
+    html = _minify_html(_INLINE_BLOCK.sub(stash, html))
+    return re.sub(r'\x00(\d+)\x00', lambda m: blocks[int(m.group(1))], html)
+
+
+def _pretty_json(value):
+    """Indented JSON for <pre>/<textarea>; only <, > and & need escaping in text"""
+    text = json.dumps(value, indent=2, ensure_ascii=False)
+    return Markup(text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;'))
+
+
+def _write(path, data):
+    """Write atomically so concurrent workers never serve a partial file"""
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _write_variants(path, data):
+    """Write a file with its gzip and (if available) brotli variants"""
+    _write(f'{path}.gz', gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _write(f'{path}.br', brotli.compress(data, quality=11))
+    _write(path, data)
+
+
+def _build_asset(filename, minifier, dist_dir):
+    """Minify a CSS/JS asset into dist under a content-hashed name"""
+    with open(os.path.join(ASSET_DIR, filename), encoding='utf-8') as f:
+        data = minifier(f.read()).encode('utf-8')
+
+    stem, ext = os.path.splitext(filename)
+    hashed_name = f'{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}'
+
+    # Drop hashes from previous builds so dist does not grow without bound
+    for old_path in glob.glob(os.path.join(dist_dir, f'{stem}.*{ext}*')):
+        if not os.path.basename(old_path).startswith(hashed_name):
+            os.remove(old_path)
+
+    _write_variants(os.path.join(dist_dir, hashed_name), data)
+    return hashed_name
+
+
+def build(dist_dir=DIST_DIR):
+    """Build the docs page and its assets, each with gzip and brotli variants"""
+    os.makedirs(dist_dir, exist_ok=True)
+
+    assets = {
+        'api-docs.css': _build_asset('api-docs.css', _minify_css, dist_dir),
+        'api-docs.js': _build_asset('api-docs.js', _minify_js, dist_dir),
+        'json-worker.js': _build_asset('json-worker.js', _minify_js, dist_dir),
+    }
+
+    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=True)
+    env.filters['pretty_json'] = _pretty_json
+    html = env.get_template('api_docs.html').render(
+        asset_url=lambda name: ASSET_URL_PREFIX + assets[name],
+        cdn_styles=CDN_STYLES,
+        prism_scripts=PRISM_SCRIPTS,
+        endpoints=ENDPOINTS
+    )
+
+    # The page is written last: it doubles as the "built" marker
+    target = os.path.join(dist_dir, DOCS_FILENAME)
+    _write_variants(target, minify(html).encode('utf-8'))
+    return target
+
+
+def _sources():
+    yield os.path.join(APP_DIR, 'api_endpoints.py')
+    for filename in os.listdir(TEMPLATE_DIR):
+        yield os.path.join(TEMPLATE_DIR, filename)
+    for filename in os.listdir(ASSET_DIR):
+        yield os.path.join(ASSET_DIR, filename)
+
+
+def ensure_built(dist_dir=DIST_DIR):
+    """Build the docs page if it is missing or older than any of its sources"""
+    target = os.path.join(dist_dir, DOCS_FILENAME)
+    try:
+        if os.path.getmtime(target) >= max(os.path.getmtime(path) for path in _sources()):
+            return target
+    except OSError:
+        pass
+    return build(dist_dir)
+
+
+if __name__ == '__main__':
+    print(f'Built {build()}')
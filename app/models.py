@@ -2,7 +2,7 @@
 from datetime import datetime
 import enum
 
-from sqlalchemy import UniqueConstraint, event, text
+from sqlalchemy import DDL, UniqueConstraint, event, text
 from sqlalchemy.dialects.postgresql import JSON
 from app import db
 
@@ -159,14 +159,27 @@ class Hospital(db.Model):
 
     # relationships
     updated_by = db.relationship('Admin', back_populates='hospitals_updated')
-    inventories = db.relationship('InventoryItem', back_populates='hospital', lazy='dynamic', cascade='all, delete-orphan')
-    floors = db.relationship('Floor', back_populates='hospital', lazy='dynamic', cascade='all, delete-orphan')
+    # passive_deletes: the ON DELETE CASCADE foreign keys remove these rows, so deleting
+    # a hospital does not load its subtree into the session first
+    inventories = db.relationship('InventoryItem', back_populates='hospital', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True)
+    floors = db.relationship('Floor', back_populates='hospital', cascade='all, delete-orphan', passive_deletes=True)
     doctors = db.relationship('Doctors_Info', secondary=hospital_doctor, back_populates='hospitals', lazy='dynamic')
     bloodbanks = db.relationship('BloodBank', secondary=bloodbank_hospital, back_populates='hospitals', lazy='dynamic')
-    opds = db.relationship('OPD', back_populates='hospital', lazy='dynamic', cascade='all, delete-orphan')
-    ambulances = db.relationship('Ambulance', back_populates='hospital', lazy='dynamic', cascade='all, delete-orphan')
+    opds = db.relationship('OPD', back_populates='hospital', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True)
+    ambulances = db.relationship('Ambulance', back_populates='hospital', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True)
     emergencies = db.relationship('Emergency', back_populates='hospital', lazy='dynamic', cascade='all, delete-orphan')
 
+    __table_args__ = (
+        # /hospital/all orders by name, optionally filtered by type; keyset pagination seeks on (name, id)
+        db.Index('ix_hospital_name_id', name, id),
+        db.Index('ix_hospital_type_name_id', hospital_type, name, id),
+        # Trigram index backing the ilike('%...%') location search (PostgreSQL only)
+        db.Index(
+            'ix_hospital_location_trgm', 'location',
+            postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+    )
+
     def __repr__(self):
         return f'<Hospital {self.name}>'
 
@@ -182,7 +195,7 @@ class Floor(db.Model):
     hospital_id = db.Column(db.Integer, db.ForeignKey('hospital.id', ondelete="CASCADE"), nullable=False)
 
     hospital = db.relationship('Hospital', back_populates='floors')
-    wards = db.relationship('Ward', back_populates='floor', lazy='dynamic', cascade='all, delete-orphan')
+    wards = db.relationship('Ward', back_populates='floor', cascade='all, delete-orphan', passive_deletes=True)
 
     __table_args__ = (
         UniqueConstraint('hospital_id', 'floor_number', name='uq_hospital_floor_number'),
@@ -211,10 +224,14 @@ class Ward(db.Model):
     category_id = db.Column(db.Integer, db.ForeignKey('ward_category.id', ondelete="SET NULL"), nullable=True)
     capacity = db.Column(db.Integer, nullable=False, default=0)
     floor_id = db.Column(db.Integer, db.ForeignKey('floor.id', ondelete="CASCADE"), nullable=False)
+    # Maintained by the bed triggers below; never written by the application
+    bed_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    occupied_beds = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    available_beds = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     floor = db.relationship('Floor', back_populates='wards')
     category = db.relationship('WardCategory', back_populates='wards')
-    beds = db.relationship('Bed', back_populates='ward', lazy='dynamic', cascade='all, delete-orphan')
+    beds = db.relationship('Bed', back_populates='ward', cascade='all, delete-orphan', passive_deletes=True)
 
     __table_args__ = (
         UniqueConstraint('floor_id', 'ward_number', name='uq_floor_ward_number'),
@@ -256,11 +273,21 @@ class Doctors_Info(db.Model):
     mail = db.Column(db.String(150), unique=True, nullable=False)
     phone = db.Column(db.String(50), nullable=True)
 
-    hospitals = db.relationship('Hospital', secondary=hospital_doctor, back_populates='doctors', lazy='dynamic')
-    schedules = db.relationship('DoctorSchedule', back_populates='doctor', lazy='dynamic', cascade='all, delete-orphan')
+    hospitals = db.relationship('Hospital', secondary=hospital_doctor, back_populates='doctors')
+    schedules = db.relationship('DoctorSchedule', back_populates='doctor', cascade='all, delete-orphan')
     visits = db.relationship('Visit', back_populates='doctor', lazy='dynamic')
     prescriptions = db.relationship('Prescription', back_populates='doctor', lazy='dynamic')
 
+    __table_args__ = (
+        # /doctor/all orders by name; keyset pagination seeks on (name, id)
+        db.Index('ix_doctors_info_name_id', name, id),
+        # Trigram index backing the ilike('%...%') specialisation search (PostgreSQL only)
+        db.Index(
+            'ix_doctors_info_specialisation_trgm', 'specialisation',
+            postgresql_using='gin', postgresql_ops={'specialisation': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+    )
+
     def __repr__(self):
         return f'<Doctor {self.name} - {self.specialisation}>'
 
@@ -358,6 +385,11 @@ class Appointment(db.Model):
     doctor = db.relationship('Doctors_Info')
     slot = db.relationship('opdSlots', back_populates='appointments')
 
+    __table_args__ = (
+        db.Index('ix_appointment_doctor_scheduled', doctor_id, scheduled_time),
+        db.Index('ix_appointment_patient_scheduled', patient_id, scheduled_time),
+    )
+
     def __repr__(self):
         return f'<Appointment {self.id} type={self.appointment_type} patient={self.patient_id}>'
 
@@ -417,6 +449,14 @@ class BloodBank(db.Model):
     inventories = db.relationship('BloodInventory', back_populates='bloodbank', lazy='dynamic', cascade='all, delete-orphan')
     reservations = db.relationship('ReserveBlood', back_populates='bloodbank', lazy='dynamic')
 
+    __table_args__ = (
+        # Trigram index backing the ilike('%...%') location search (PostgreSQL only)
+        db.Index(
+            'ix_blood_bank_location_trgm', 'location',
+            postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+    )
+
     def __repr__(self):
         return f'<BloodBank {self.name}>'
 
@@ -468,6 +508,12 @@ class ReserveBlood(db.Model):
     status = db.Column(db.Enum(StatusEnum), default=StatusEnum.PENDING, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # Serve "ORDER BY created_at DESC" listings straight from the index
+        db.Index('ix_reserve_blood_user_created', user_id, created_at.desc()),
+        db.Index('ix_reserve_blood_status_created', status, created_at.desc()),
+    )
+
     def __repr__(self):
         return f'<ReserveBlood {self.id} blood_group={self.blood_group}>'
 
@@ -508,7 +554,7 @@ class Supplier(db.Model):
 class InventoryItem(db.Model):
     __tablename__ = 'inventory_item'
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    hospital_id = db.Column(db.Integer, db.ForeignKey('hospital.id'), nullable=False)
+    hospital_id = db.Column(db.Integer, db.ForeignKey('hospital.id', ondelete="CASCADE"), nullable=False)
     drug_name = db.Column(db.String(150), nullable=False)
     quantity = db.Column(db.Integer, nullable=False, default=0)
     expiry_time = db.Column(db.Date, nullable=True)
@@ -541,6 +587,16 @@ class Ambulance(db.Model):
 
     hospital = db.relationship('Hospital', back_populates='ambulances')
 
+    __table_args__ = (
+        # Partial index over the vacant fleet only: the available-ambulances listing
+        # reads a small index that shrinks as ambulances are dispatched
+        db.Index(
+            'ix_ambulance_vacant_hospital_type', hospital_id, type,
+            postgresql_where=(status == AmbulanceStatus.VACANT),
+            sqlite_where=(status == AmbulanceStatus.VACANT)
+        ),
+    )
+
     def __repr__(self):
         return f'<Ambulance {self.id} status={self.status}>'
 
@@ -604,6 +660,14 @@ class Notification(db.Model):
 
     user = db.relationship('Users')
 
+    __table_args__ = (
+        # Partial index for the unread count: only unread rows, so it stays small
+        db.Index(
+            'ix_notification_user_unread', user_id,
+            postgresql_where=read.is_(False), sqlite_where=read.is_(False)
+        ),
+    )
+
     def __repr__(self):
         return f'<Notification {self.id} to={self.user_id}>'
 
@@ -633,10 +697,81 @@ class Emergency(db.Model):
     hospital = db.relationship('Hospital', back_populates='emergencies')
     forwards = db.relationship('ForwardedRequest', back_populates='emergency', lazy='dynamic', cascade='all, delete-orphan')
 
+    __table_args__ = (
+        # Newest-first listing and keyset pagination of /emergency/all seek on (created_at, id)
+        db.Index('ix_emergency_created_id', created_at.desc(), id.desc()),
+        # Status-filtered listing, newest first
+        db.Index('ix_emergency_status_created', forward_status, created_at.desc()),
+        # emergency_type is a short category list, filtered by exact match
+        db.Index('ix_emergency_type_created', emergency_type, created_at.desc()),
+    )
+
     def __repr__(self):
         return f'<Emergency {self.id} type={self.emergency_type}>'
 
 
+# ---------------------------
+# PostgreSQL extensions required by the indexes above
+# ---------------------------
+event.listen(
+    db.metadata,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
+
+
+# ---------------------------
+# Ward bed counters: kept current by triggers on bed, so reads never count rows.
+# The enum column stores member names ('OCCUPIED', 'VACANT').
+# ---------------------------
+_PG_BED_COUNTERS = """
+CREATE OR REPLACE FUNCTION ward_bed_counters() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE ward SET bed_count = bed_count - 1,
+            occupied_beds = occupied_beds - (OLD.status = 'OCCUPIED')::int,
+            available_beds = available_beds - (OLD.status = 'VACANT')::int
+        WHERE id = OLD.ward_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE ward SET bed_count = bed_count + 1,
+            occupied_beds = occupied_beds + (NEW.status = 'OCCUPIED')::int,
+            available_beds = available_beds + (NEW.status = 'VACANT')::int
+        WHERE id = NEW.ward_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER bed_ward_counters
+AFTER INSERT OR DELETE OR UPDATE OF ward_id, status ON bed
+FOR EACH ROW EXECUTE FUNCTION ward_bed_counters();
+"""
+
+_SQLITE_ADD_BED = """
+    UPDATE ward SET bed_count = bed_count + 1,
+        occupied_beds = occupied_beds + (NEW.status = 'OCCUPIED'),
+        available_beds = available_beds + (NEW.status = 'VACANT')
+    WHERE id = NEW.ward_id;
+"""
+_SQLITE_REMOVE_BED = """
+    UPDATE ward SET bed_count = bed_count - 1,
+        occupied_beds = occupied_beds - (OLD.status = 'OCCUPIED'),
+        available_beds = available_beds - (OLD.status = 'VACANT')
+    WHERE id = OLD.ward_id;
+"""
+_SQLITE_BED_COUNTERS = (
+    f"CREATE TRIGGER bed_ward_counters_insert AFTER INSERT ON bed BEGIN {_SQLITE_ADD_BED} END",
+    f"CREATE TRIGGER bed_ward_counters_delete AFTER DELETE ON bed BEGIN {_SQLITE_REMOVE_BED} END",
+    f"CREATE TRIGGER bed_ward_counters_update AFTER UPDATE OF ward_id, status ON bed "
+    f"BEGIN {_SQLITE_REMOVE_BED} {_SQLITE_ADD_BED} END",
+)
+
+event.listen(Bed.__table__, 'after_create', DDL(_PG_BED_COUNTERS).execute_if(dialect='postgresql'))
+for _statement in _SQLITE_BED_COUNTERS:
+    event.listen(Bed.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+
+
 # ---------------------------
 # DB-level Guard: single-floor enforcement
 # ---------------------------
@@ -1,44 +1,92 @@
-from flask import Blueprint, request
+import orjson
+from flask import Blueprint, request, Response, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
 from app.models import (
     db, BloodBank, BloodInventory, ReserveBlood, StatusEnum, Hospital
 )
 from app.auth.decorators import admin_required, hospital_admin_or_admin_required
+from app.schemas import load_payload, BloodBankRegisterIn, BloodStockIn, BloodRequestIn
 from app.utils.helpers import (
-    serialize_model, create_success_response, create_error_response,
-    validate_email
+    serialize_model, create_success_response, create_error_response
 )
 
 blood_bank_bp = Blueprint('blood_bank', __name__)
 
+# Atomically add units to stock_levels[blood_type] and register blood_type in
+# blood_types_available, without shipping the JSON documents to the app
+_INCREMENT_STOCK_SQL = {
+    'postgresql': text("""
+        UPDATE blood_bank SET
+            stock_levels = jsonb_set(
+                coalesce(stock_levels::jsonb, '{}'::jsonb),
+                ARRAY[CAST(:blood_type AS text)],
+                to_jsonb(coalesce((stock_levels::jsonb ->> CAST(:blood_type AS text))::int, 0) + :units)
+            )::json,
+            blood_types_available = CASE
+                WHEN coalesce(blood_types_available::jsonb, '[]'::jsonb) @> jsonb_build_array(CAST(:blood_type AS text))
+                THEN blood_types_available
+                ELSE (coalesce(blood_types_available::jsonb, '[]'::jsonb) || jsonb_build_array(CAST(:blood_type AS text)))::json
+            END
+        WHERE id = :bloodbank_id
+    """),
+    'sqlite': text("""
+        UPDATE blood_bank SET
+            stock_levels = json_set(
+                coalesce(stock_levels, '{}'),
+                :path,
+                coalesce(json_extract(stock_levels, :path), 0) + :units
+            ),
+            blood_types_available = CASE
+                WHEN EXISTS (SELECT 1 FROM json_each(coalesce(blood_types_available, '[]')) WHERE value = :blood_type)
+                THEN blood_types_available
+                ELSE json_insert(coalesce(blood_types_available, '[]'), '$[#]', :blood_type)
+            END
+        WHERE id = :bloodbank_id
+    """),
+}
+
+
+def _increment_stock_levels(bloodbank_id, blood_type, units):
+    """Apply a stock increment in a single UPDATE; returns False if the blood bank does not exist"""
+    statement = _INCREMENT_STOCK_SQL.get(db.session.get_bind().dialect.name)
+    if statement is None:
+        # No JSON UPDATE for this dialect: lock the row and update the documents in Python
+        blood_bank = db.session.get(BloodBank, bloodbank_id, with_for_update=True)
+        if not blood_bank:
+            return False
+        
+        # New objects, so the JSON columns register as changed
+        stock_levels = dict(blood_bank.stock_levels or {})
+        stock_levels[blood_type] = stock_levels.get(blood_type, 0) + units
+        blood_bank.stock_levels = stock_levels
+        
+        if blood_type not in (blood_bank.blood_types_available or []):
+            blood_bank.blood_types_available = list(blood_bank.blood_types_available or []) + [blood_type]
+        return True
+    
+    result = db.session.execute(
+        statement,
+        # The SQLite JSON path for the blood type's key; BloodStockIn allows only the 8 types
+        {'bloodbank_id': bloodbank_id, 'blood_type': blood_type, 'units': units, 'path': f'$."{blood_type}"'}
+    )
+    return result.rowcount > 0
+
 
 @blood_bank_bp.route('/register', methods=['POST'])
 @admin_required
 def register_blood_bank():
     """Register a new blood bank"""
     try:
-        data = request.get_json()
-        
-        required_fields = ['name', 'location', 'contact_no', 'email']
-        for field in required_fields:
-            if not data.get(field):
-                return create_error_response(f'{field} is required', status_code=400)
+        payload, error = load_payload(BloodBankRegisterIn, request.get_json())
+        if error:
+            return create_error_response(error, status_code=400)
         
-        if not validate_email(data['email']):
-            return create_error_response('Invalid email format', status_code=400)
-        
-        if BloodBank.query.filter_by(email=data['email']).first():
+        if BloodBank.query.filter_by(email=payload.email).first():
             return create_error_response('Email already registered', status_code=409)
         
-        blood_bank = BloodBank(
-            name=data['name'],
-            location=data['location'],
-            contact_no=data['contact_no'],
-            email=data['email'],
-            blood_types_available=data.get('blood_types_available', []),
-            stock_levels=data.get('stock_levels', {}),
-            category=data.get('category')
-        )
+        blood_bank = BloodBank(**payload.model_dump())
         
         db.session.add(blood_bank)
         db.session.commit()
@@ -109,58 +157,43 @@ def get_all_blood_banks():
 def add_blood_stock(bloodbank_id):
     """Add blood stock to a blood bank"""
     try:
-        blood_bank = BloodBank.query.get(bloodbank_id)
-        if not blood_bank:
-            return create_error_response('Blood bank not found', status_code=404)
-        
-        data = request.get_json()
+        payload, error = load_payload(BloodStockIn, request.get_json())
+        if error:
+            return create_error_response(error, status_code=400)
         
-        required_fields = ['blood_type', 'units']
-        for field in required_fields:
-            if field not in data:
-                return create_error_response(f'{field} is required', status_code=400)
+        # The stock UPDATE doubles as the existence check for the blood bank
+        if not _increment_stock_levels(bloodbank_id, payload.blood_type, payload.units):
+            db.session.rollback()
+            return create_error_response('Blood bank not found', status_code=404)
         
         # Check if inventory already exists for this blood type and lot
         existing_inventory = BloodInventory.query.filter_by(
             bloodbank_id=bloodbank_id,
-            blood_type=data['blood_type'],
-            lot_number=data.get('lot_number')
+            blood_type=payload.blood_type,
+            lot_number=payload.lot_number
         ).first()
         
         if existing_inventory:
             # Update existing inventory
-            existing_inventory.units += data['units']
-            if data.get('expiry_date'):
-                existing_inventory.expiry_date = data['expiry_date']
+            existing_inventory.units += payload.units
+            if payload.expiry_date:
+                existing_inventory.expiry_date = payload.expiry_date
         else:
             # Create new inventory record
             inventory = BloodInventory(
                 bloodbank_id=bloodbank_id,
-                blood_type=data['blood_type'],
-                units=data['units'],
-                expiry_date=data.get('expiry_date'),
-                lot_number=data.get('lot_number')
+                **payload.model_dump()
             )
             db.session.add(inventory)
         
-        # Update blood bank's available types if not already present
-        if data['blood_type'] not in (blood_bank.blood_types_available or []):
-            if blood_bank.blood_types_available:
-                blood_bank.blood_types_available.append(data['blood_type'])
-            else:
-                blood_bank.blood_types_available = [data['blood_type']]
-        
-        # Update stock levels in blood bank
-        if not blood_bank.stock_levels:
-            blood_bank.stock_levels = {}
-        
-        current_stock = blood_bank.stock_levels.get(data['blood_type'], 0)
-        blood_bank.stock_levels[data['blood_type']] = current_stock + data['units']
-        
         db.session.commit()
         
         return create_success_response('Blood stock added successfully')
         
+    except IntegrityError:
+        # The blood bank was deleted before the inventory row was written
+        db.session.rollback()
+        return create_error_response('Blood bank not found', status_code=404)
     except Exception as e:
         db.session.rollback()
         return create_error_response(f'Failed to add blood stock: {str(e)}', status_code=500)
@@ -170,7 +203,7 @@ def add_blood_stock(bloodbank_id):
 def get_blood_stock(bloodbank_id):
     """Get blood stock details for a blood bank"""
     try:
-        blood_bank = BloodBank.query.get(bloodbank_id)
+        blood_bank = db.session.get(BloodBank, bloodbank_id)
         if not blood_bank:
             return create_error_response('Blood bank not found', status_code=404)
         
@@ -196,26 +229,15 @@ def request_blood():
     """Request blood from blood banks"""
     try:
         current_user_id = get_jwt_identity()
-        data = request.get_json()
-        
-        required_fields = ['blood_group', 'quantity_units', 'location', 'reference']
-        for field in required_fields:
-            if not data.get(field):
-                return create_error_response(f'{field} is required', status_code=400)
+        payload, error = load_payload(BloodRequestIn, request.get_json())
+        if error:
+            return create_error_response(error, status_code=400)
         
         # Create blood request
         blood_request = ReserveBlood(
             user_id=current_user_id,
-            requester_name=data.get('requester_name', 'none'),
-            requester_phone=data.get('requester_phone', 'none'),
-            requester_email=data.get('requester_email', 'none'),
-            blood_group=data['blood_group'],
-            quantity_units=data['quantity_units'],
-            location=data['location'],
-            reference=data['reference'],
-            bloodbank_id=data.get('bloodbank_id'),
-            blood_inventory_id=data.get('blood_inventory_id'),
-            status=StatusEnum.PENDING
+            status=StatusEnum.PENDING,
+            **payload.model_dump()
         )
         
         db.session.add(blood_request)
@@ -298,6 +320,35 @@ def get_blood_requests():
         return create_error_response(f'Failed to retrieve blood requests: {str(e)}', status_code=500)
 
 
+@blood_bank_bp.route('/requests/export', methods=['GET'])
+@admin_required
+def export_blood_requests():
+    """Stream every blood request as JSON using a server-side cursor"""
+    status_filter = request.args.get('status')
+    
+    query = ReserveBlood.query
+    
+    if status_filter:
+        try:
+            query = query.filter_by(status=StatusEnum(status_filter))
+        except ValueError:
+            return create_error_response('Invalid status filter', status_code=400)
+    
+    # Rows are fetched in batches from a server-side cursor rather than
+    # materialized up front, so memory stays bounded for large exports
+    query = query.order_by(ReserveBlood.id).execution_options(stream_results=True).yield_per(200)
+    
+    def generate():
+        yield b'{"success": true, "message": "Blood requests exported successfully", "data": {"requests": ['
+        for index, blood_request in enumerate(query):
+            if index:
+                yield b','
+            yield orjson.dumps(serialize_model(blood_request))
+        yield b']}}'
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+
 @blood_bank_bp.route('/inventory', methods=['GET'])
 @admin_required
 def get_blood_inventory():
@@ -1,20 +1,26 @@
+from concurrent.futures import ThreadPoolExecutor
 from flask import Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from sqlalchemy import select
 from app.models import db, Users, Hospital, Appointment, Emergency
-from app.utils.helpers import serialize_model, create_success_response, create_error_response
+from app.utils.helpers import (
+    serialize_model, serialize_row, create_success_response, create_error_response
+)
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
+# Worker threads for the admin dashboard's independent queries
+_dashboard_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='dashboard')
+
 
 @dashboard_bp.route('/', methods=['GET'])
 @jwt_required()
 def get_dashboard():
     """Get dashboard data based on user role"""
     try:
+        # Resolve the token once; the role helpers receive plain values
         current_user_id = get_jwt_identity()
-        claims = get_jwt()
-        user_role = claims.get('role')
-        user_type = claims.get('type', 'user')
+        user_role = get_jwt().get('role')
         
         if user_role == 'admin':
             return get_admin_dashboard()
@@ -29,26 +35,74 @@ def get_dashboard():
         return create_error_response(f'Dashboard error: {str(e)}', status_code=500)
 
 
+def _appointment_counts(criterion):
+    """Count total and upcoming appointments matching criterion in one query"""
+    total, upcoming = db.session.query(
+        db.func.count(Appointment.id),
+        db.func.count(Appointment.id).filter(Appointment.scheduled_time > db.func.now())
+    ).filter(criterion).one()
+    
+    return {
+        'total_appointments': total,
+        'upcoming_appointments': upcoming
+    }
+
+
+# The appointment fields the doctor and user dashboards show
+_RECENT_APPOINTMENT_FIELDS = (
+    'id', 'appointment_type', 'status', 'scheduled_time', 'reason',
+    'patient_id', 'doctor_id', 'hospital_id'
+)
+
+
+def _recent_appointments(criterion, limit):
+    """Fetch the latest appointments as plain rows of the dashboard fields, skipping ORM hydration"""
+    rows = db.session.execute(
+        select(*(getattr(Appointment, field) for field in _RECENT_APPOINTMENT_FIELDS))
+        .where(criterion)
+        .order_by(Appointment.scheduled_time.desc())
+        .limit(limit)
+    ).all()
+    
+    return [serialize_row(Appointment, row, fields=_RECENT_APPOINTMENT_FIELDS) for row in rows]
+
+
+def _execute_concurrently(statements):
+    """Execute independent read statements in parallel, each on its own pooled connection"""
+    engine = db.engine
+    
+    # SQLite shares one connection per database file, so there is nothing to overlap
+    if engine.dialect.name == 'sqlite':
+        return [db.session.execute(statement).all() for statement in statements]
+    
+    def run(statement):
+        with engine.connect() as connection:
+            return connection.execute(statement).all()
+    
+    return list(_dashboard_executor.map(run, statements))
+
+
 def get_admin_dashboard():
     """Get admin dashboard data"""
     try:
-        stats = {
-            'total_users': Users.query.count(),
-            'total_hospitals': Hospital.query.count(),
-            'total_appointments': Appointment.query.count(),
-            'total_emergencies': Emergency.query.count()
-        }
-        
-        # Recent activities
-        recent_users = Users.query.order_by(Users.created_at.desc()).limit(5).all()
-        recent_appointments = Appointment.query.order_by(Appointment.created_at.desc()).limit(5).all()
-        recent_emergencies = Emergency.query.order_by(Emergency.created_at.desc()).limit(5).all()
+        stats_rows, recent_users, recent_appointments, recent_emergencies = _execute_concurrently([
+            select(
+                select(db.func.count(Users.id)).scalar_subquery().label('total_users'),
+                select(db.func.count(Hospital.id)).scalar_subquery().label('total_hospitals'),
+                select(db.func.count(Appointment.id)).scalar_subquery().label('total_appointments'),
+                select(db.func.count(Emergency.id)).scalar_subquery().label('total_emergencies')
+            ),
+            # Recent activities
+            select(*Users.__table__.columns).order_by(Users.created_at.desc()).limit(5),
+            select(*Appointment.__table__.columns).order_by(Appointment.created_at.desc()).limit(5),
+            select(*Emergency.__table__.columns).order_by(Emergency.created_at.desc()).limit(5)
+        ])
         
         dashboard_data = {
-            'stats': stats,
-            'recent_users': [serialize_model(u, exclude=['password']) for u in recent_users],
-            'recent_appointments': [serialize_model(a) for a in recent_appointments],
-            'recent_emergencies': [serialize_model(e) for e in recent_emergencies]
+            'stats': dict(stats_rows[0]._mapping),
+            'recent_users': [serialize_row(Users, u, exclude=['password']) for u in recent_users],
+            'recent_appointments': [serialize_row(Appointment, a) for a in recent_appointments],
+            'recent_emergencies': [serialize_row(Emergency, e) for e in recent_emergencies]
         }
         
         return create_success_response(
@@ -72,11 +126,10 @@ def get_hospital_dashboard(hospital_id):
         
         stats = {
             'total_appointments': Appointment.query.filter_by(hospital_id=hospital.id).count(),
-            'total_floors': hospital.floors.count(),
-            'total_wards': sum(floor.wards.count() for floor in hospital.floors),
-            'total_beds': sum(bed_count for floor in hospital.floors 
-                            for ward in floor.wards 
-                            for bed_count in [ward.beds.count()])
+            'total_floors': len(hospital.floors),
+            'total_wards': sum(len(floor.wards) for floor in hospital.floors),
+            'total_beds': sum(ward.bed_count for floor in hospital.floors
+                            for ward in floor.wards)
         }
         
         dashboard_data = {
@@ -101,22 +154,14 @@ def get_doctor_dashboard(user_id):
             return create_error_response('User not found', status_code=404)
         
         # Get doctor's appointments
-        appointments = Appointment.query.filter_by(doctor_id=user_id).order_by(
-            Appointment.scheduled_time.desc()
-        ).limit(10).all()
+        appointments = _recent_appointments(Appointment.doctor_id == user_id, 10)
         
-        stats = {
-            'total_appointments': Appointment.query.filter_by(doctor_id=user_id).count(),
-            'upcoming_appointments': Appointment.query.filter(
-                Appointment.doctor_id == user_id,
-                Appointment.scheduled_time > db.func.now()
-            ).count()
-        }
+        stats = _appointment_counts(Appointment.doctor_id == user_id)
         
         dashboard_data = {
             'user': serialize_model(user, exclude=['password']),
             'stats': stats,
-            'recent_appointments': [serialize_model(a) for a in appointments]
+            'recent_appointments': appointments
         }
         
         return create_success_response(
@@ -136,22 +181,14 @@ def get_user_dashboard(user_id):
             return create_error_response('User not found', status_code=404)
         
         # Get user's appointments
-        appointments = Appointment.query.filter_by(patient_id=user_id).order_by(
-            Appointment.scheduled_time.desc()
-        ).limit(5).all()
+        appointments = _recent_appointments(Appointment.patient_id == user_id, 5)
         
-        stats = {
-            'total_appointments': Appointment.query.filter_by(patient_id=user_id).count(),
-            'upcoming_appointments': Appointment.query.filter(
-                Appointment.patient_id == user_id,
-                Appointment.scheduled_time > db.func.now()
-            ).count()
-        }
+        stats = _appointment_counts(Appointment.patient_id == user_id)
         
         dashboard_data = {
             'user': serialize_model(user, exclude=['password']),
             'stats': stats,
-            'recent_appointments': [serialize_model(a) for a in appointments]
+            'recent_appointments': appointments
         }
         
         return create_success_response(
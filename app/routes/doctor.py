@@ -1,45 +1,64 @@
-from flask import Blueprint, request
+import hashlib
+from flask import Blueprint, Response, make_response, request
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from sqlalchemy import exists, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
 from app.models import db, Doctors_Info, DoctorSchedule, Hospital
 from app.auth.decorators import admin_required, doctor_or_admin_required
+from app.schemas import load_payload, DoctorRegisterIn, DoctorScheduleIn
+from app.services.cache_service import DoctorCache, cache_service, query_cache_key
 from app.utils.helpers import (
     serialize_model, create_success_response, create_error_response,
-    validate_email
+    keyset_paginate, serialize_many, read_replica, parse_per_page, MAX_PER_PAGE
 )
 
 doctor_bp = Blueprint('doctor', __name__)
 
 
+def _doctor_list_etag(query_key):
+    """ETag for a /doctor/all page: the roster version plus the query args, or None without Redis"""
+    version = DoctorCache.get_roster_version()
+    if version is None:
+        # Uncached, the version would cost a COUNT on every request; serve pages without an ETag
+        if not cache_service.is_available():
+            return None
+        
+        # Doctors are only ever inserted, so the row count and highest id move with every write
+        count, max_id = db.session.execute(
+            select(func.count(Doctors_Info.id), func.max(Doctors_Info.id))
+        ).one()
+        version = f'{max_id}:{count}'
+        DoctorCache.set_roster_version(version)
+    return hashlib.sha1(f'{version}:{query_key}'.encode()).hexdigest()
+
+
+def _doctor_list_response(data, etag):
+    """/doctor/all success response carrying its ETag, if it has one"""
+    response = make_response(create_success_response('Doctors retrieved successfully', data))
+    if etag:
+        response.set_etag(etag)
+    return response
+
+
 @doctor_bp.route('/register', methods=['POST'])
 @admin_required
 def register_doctor():
     """Register a new doctor"""
     try:
-        data = request.get_json()
+        payload, error = load_payload(DoctorRegisterIn, request.get_json())
+        if error:
+            return create_error_response(error, status_code=400)
         
-        required_fields = ['name', 'mail']
-        for field in required_fields:
-            if not data.get(field):
-                return create_error_response(f'{field} is required', status_code=400)
-        
-        if not validate_email(data['mail']):
-            return create_error_response('Invalid email format', status_code=400)
-        
-        if Doctors_Info.query.filter_by(mail=data['mail']).first():
-            return create_error_response('Email already registered', status_code=409)
-        
-        doctor = Doctors_Info(
-            name=data['name'],
-            specialisation=data.get('specialisation'),
-            availability=data.get('availability'),
-            mail=data['mail'],
-            phone=data.get('phone')
-        )
+        doctor = Doctors_Info(**payload.model_dump())
         
         db.session.add(doctor)
-        db.session.commit()
-        
+        # Serialize between flush and commit: the INSERT has filled in the id, and
+        # the commit would expire the row and cost a refresh SELECT
+        db.session.flush()
         doctor_data = serialize_model(doctor)
+        db.session.commit()
+        DoctorCache.invalidate_doctor_lists()
         
         return create_success_response(
             'Doctor registered successfully',
@@ -47,17 +66,43 @@ def register_doctor():
             status_code=201
         )
         
+    except IntegrityError:
+        # UNIQUE(mail) rejects duplicates in the INSERT itself, with no check-then-insert race
+        db.session.rollback()
+        return create_error_response('Email already registered', status_code=409)
     except Exception as e:
         db.session.rollback()
         return create_error_response(f'Doctor registration failed: {str(e)}', status_code=500)
 
 
 @doctor_bp.route('/all', methods=['GET'])
+@read_replica
 def get_all_doctors():
     """Get all doctors"""
     try:
+        # Reject oversized pages before any query or cache lookup
+        try:
+            per_page = parse_per_page(request.args)
+        except ValueError:
+            return create_error_response(f'per_page must be an integer between 1 and {MAX_PER_PAGE}', status_code=400)
+        
+        cache_key = query_cache_key(request.args)
+        
+        # Pollers holding the current page get a 304 before any listing query or serialization
+        etag = _doctor_list_etag(cache_key)
+        if etag and etag in request.if_none_match:
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+        
+        # The roster changes rarely; repeat queries are served from Redis. The version
+        # is read once, so a page built before a write is stored under the old one
+        cache_version = DoctorCache.get_list_version()
+        cached_data = DoctorCache.get_doctor_list(cache_version, cache_key)
+        if cached_data is not None:
+            return _doctor_list_response(cached_data, etag)
+        
         page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
         specialisation = request.args.get('specialisation')
         
         query = Doctors_Info.query
@@ -65,22 +110,35 @@ def get_all_doctors():
         if specialisation:
             query = query.filter(Doctors_Info.specialisation.ilike(f'%{specialisation}%'))
         
-        query = query.order_by(Doctors_Info.name)
-        
-        pagination = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
-        
-        doctors = []
-        for doctor in pagination.items:
-            doctors.append(serialize_model(doctor))
-        
-        return create_success_response(
-            'Doctors retrieved successfully',
-            {
-                'doctors': doctors,
+        if 'cursor' in request.args:
+            # Keyset mode: seek past the previous page instead of OFFSET + COUNT(*)
+            try:
+                rows, next_cursor = keyset_paginate(
+                    query, [Doctors_Info.name, Doctors_Info.id],
+                    request.args['cursor'], per_page
+                )
+            except ValueError:
+                return create_error_response('Invalid cursor', status_code=400)
+            
+            data = {
+                'doctors': serialize_many(Doctors_Info, rows),
+                'pagination': {
+                    'per_page': per_page,
+                    'has_next': next_cursor is not None,
+                    'next_cursor': next_cursor
+                }
+            }
+        else:
+            query = query.order_by(Doctors_Info.name)
+            
+            pagination = query.paginate(
+                page=page,
+                per_page=per_page,
+                error_out=False
+            )
+            
+            data = {
+                'doctors': serialize_many(Doctors_Info, pagination.items),
                 'pagination': {
                     'page': pagination.page,
                     'pages': pagination.pages,
@@ -90,17 +148,25 @@ def get_all_doctors():
                     'has_prev': pagination.has_prev
                 }
             }
-        )
+        
+        DoctorCache.set_doctor_list(cache_version, cache_key, data)
+        
+        return _doctor_list_response(data, etag)
         
     except Exception as e:
         return create_error_response(f'Failed to retrieve doctors: {str(e)}', status_code=500)
 
 
 @doctor_bp.route('/<int:doctor_id>', methods=['GET'])
+@read_replica
 def get_doctor(doctor_id):
     """Get doctor details"""
     try:
-        doctor = Doctors_Info.query.get(doctor_id)
+        # Load the hospitals with the doctor: one extra IN query instead of a lazy load
+        doctor = db.session.get(
+            Doctors_Info, doctor_id,
+            options=[selectinload(Doctors_Info.hospitals)]
+        )
         if not doctor:
             return create_error_response('Doctor not found', status_code=404)
         
@@ -126,37 +192,30 @@ def get_doctor(doctor_id):
 def create_doctor_schedule():
     """Create doctor schedule"""
     try:
-        data = request.get_json()
-        
-        required_fields = ['doctor_id', 'hospital_id']
-        for field in required_fields:
-            if not data.get(field):
-                return create_error_response(f'{field} is required', status_code=400)
+        payload, error = load_payload(DoctorScheduleIn, request.get_json())
+        if error:
+            return create_error_response(error, status_code=400)
         
-        # Verify doctor and hospital exist
-        doctor = Doctors_Info.query.get(data['doctor_id'])
-        if not doctor:
+        # Verify doctor and hospital exist in a single round-trip, without loading either row
+        doctor_exists, hospital_exists = db.session.execute(
+            select(
+                exists().where(Doctors_Info.id == payload.doctor_id),
+                exists().where(Hospital.id == payload.hospital_id)
+            )
+        ).one()
+        if not doctor_exists:
             return create_error_response('Doctor not found', status_code=404)
         
-        hospital = Hospital.query.get(data['hospital_id'])
-        if not hospital:
+        if not hospital_exists:
             return create_error_response('Hospital not found', status_code=404)
         
-        schedule = DoctorSchedule(
-            doctor_id=data['doctor_id'],
-            hospital_id=data['hospital_id'],
-            day_of_week=data.get('day_of_week'),
-            start_time=data.get('start_time'),
-            end_time=data.get('end_time'),
-            specific_date=data.get('specific_date'),
-            notes=data.get('notes')
-        )
+        schedule = DoctorSchedule(**payload.model_dump())
         
         db.session.add(schedule)
+        db.session.flush()
+        schedule_data = serialize_model(schedule)  # before commit expires it
         db.session.commit()
         
-        schedule_data = serialize_model(schedule)
-        
         return create_success_response(
             'Doctor schedule created successfully',
             {'schedule': schedule_data},
@@ -169,10 +228,15 @@ def create_doctor_schedule():
 
 
 @doctor_bp.route('/<int:doctor_id>/schedule', methods=['GET'])
+@read_replica
 def get_doctor_schedule(doctor_id):
     """Get doctor's schedule"""
     try:
-        doctor = Doctors_Info.query.get(doctor_id)
+        # Schedules and their hospitals come back in one IN query with a join
+        doctor = db.session.get(
+            Doctors_Info, doctor_id,
+            options=[selectinload(Doctors_Info.schedules).joinedload(DoctorSchedule.hospital)]
+        )
         if not doctor:
             return create_error_response('Doctor not found', status_code=404)
         
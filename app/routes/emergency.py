@@ -1,40 +1,81 @@
-from flask import Blueprint, request
+from datetime import datetime
+from itertools import chain
+import orjson
+from flask import Blueprint, request, Response, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
-from app.models import db, Emergency, Hospital, Ambulance, AmbulanceStatus
+from sqlalchemy import event, exists, select
+from sqlalchemy.orm import joinedload
+from app.models import db, Emergency, Hospital, Ambulance, AmbulanceStatus, Users
 from app.auth.decorators import admin_required, api_key_required
+from app.services.cache_service import AmbulanceCache, query_cache_key
+from app.services.emergency_queue import emergency_inbox
+from app.schemas import load_payload, EmergencyCallIn
 from app.utils.helpers import (
     serialize_model, create_success_response, create_error_response,
-    save_uploaded_file
+    save_uploaded_file, keyset_paginate, model_serializer, read_replica,
+    prefixed_columns, joined_fields, parse_per_page, MAX_PER_PAGE
 )
 
 emergency_bp = Blueprint('emergency', __name__)
 
+# Columns listings embed for related rows; only these are SELECTed
+HOSPITAL_SUMMARY_FIELDS = ['id', 'name', 'location', 'contact_num']
+USER_SUMMARY_FIELDS = ['id', 'username', 'fullname', 'email', 'phone_num']
+
+
+def _summary_columns(model_class, fields):
+    """Map summary field names to columns for load_only"""
+    return [getattr(model_class, field) for field in fields]
+
+
+def _missing_reference(payload):
+    """Name the referenced hospital or user that does not exist, checking both in one SELECT"""
+    checks = {}
+    if payload.hospital_id is not None:
+        checks['Hospital'] = exists().where(Hospital.id == payload.hospital_id)
+    if payload.user_id is not None:
+        checks['User'] = exists().where(Users.id == payload.user_id)
+    if not checks:
+        return None
+    
+    found = db.session.execute(select(*checks.values())).one()
+    return next((name for name, ok in zip(checks, found) if not ok), None)
+
 
 @emergency_bp.route('/call', methods=['POST'])
 def log_emergency():
     """Log an emergency request"""
     try:
-        data = request.get_json()
-        
-        required_fields = ['emergency_type', 'location', 'contact_number']
-        for field in required_fields:
-            if not data.get(field):
-                return create_error_response(f'{field} is required', status_code=400)
-        
-        emergency = Emergency(
-            emergency_type=data['emergency_type'],
-            location=data['location'],
-            contact_number=data['contact_number'],
-            details=data.get('details'),
-            hospital_id=data.get('hospital_id'),
-            user_id=data.get('user_id'),
-            user_ip=request.remote_addr
-        )
+        payload, error = load_payload(EmergencyCallIn, request.get_json())
+        if error:
+            return create_error_response(error, status_code=400)
+        
+        # Checked before queueing: after the 202 a bad reference could only be dead-lettered
+        missing = _missing_reference(payload)
+        if missing:
+            return create_error_response(f'{missing} not found', status_code=404)
+        
+        fields = payload.model_dump()
+        fields['user_ip'] = request.remote_addr
+        fields['created_at'] = datetime.utcnow()
+        
+        # Acknowledge as soon as the call is in the Redis inbox; the worker writes the row
+        reference = emergency_inbox.enqueue(fields)
+        if reference:
+            return create_success_response(
+                'Emergency received',
+                {'reference': reference, 'status': 'queued'},
+                status_code=202
+            )
+        
+        emergency = Emergency(**fields)
         
         db.session.add(emergency)
-        db.session.commit()
-        
+        # Serialize between flush and commit: the INSERT has filled in the id, and
+        # the commit would expire the row and cost a refresh SELECT
+        db.session.flush()
         emergency_data = serialize_model(emergency)
+        db.session.commit()
         
         return create_success_response(
             'Emergency logged successfully',
@@ -49,55 +90,95 @@ def log_emergency():
 
 @emergency_bp.route('/all', methods=['GET'])
 @admin_required
+@read_replica
 def get_all_emergencies():
     """Get all emergency cases"""
     try:
+        try:
+            per_page = parse_per_page(request.args)
+        except ValueError:
+            return create_error_response(f'per_page must be an integer between 1 and {MAX_PER_PAGE}', status_code=400)
+        
         page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
         emergency_type = request.args.get('type')
         status = request.args.get('status')
         
-        query = Emergency.query
+        # One SELECT returns plain rows: the emergency columns plus the hospital and
+        # reporting-user summaries from outer joins, with no ORM objects built
+        query = db.session.query(
+            *Emergency.__table__.columns,
+            *prefixed_columns(Hospital, HOSPITAL_SUMMARY_FIELDS, 'hospital'),
+            *prefixed_columns(Users, USER_SUMMARY_FIELDS, 'user')
+        ).outerjoin(
+            Hospital, Emergency.hospital_id == Hospital.id
+        ).outerjoin(
+            Users, Emergency.user_id == Users.id
+        )
         
         if emergency_type:
-            query = query.filter(Emergency.emergency_type.ilike(f'%{emergency_type}%'))
+            # Exact match so the B-tree index applies; a leading-wildcard ILIKE scans the table
+            query = query.filter(Emergency.emergency_type == emergency_type)
         
         if status:
             query = query.filter(Emergency.forward_status == status)
         
-        query = query.order_by(Emergency.created_at.desc())
-        
-        pagination = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
-        
-        emergencies = []
-        for emergency in pagination.items:
-            emergency_data = serialize_model(emergency)
-            
-            if emergency.hospital:
-                emergency_data['hospital'] = serialize_model(emergency.hospital)
-            if emergency.user:
-                emergency_data['user'] = serialize_model(emergency.user, exclude=['password'])
-            
-            emergencies.append(emergency_data)
-        
-        return create_success_response(
-            'Emergencies retrieved successfully',
-            {
-                'emergencies': emergencies,
-                'pagination': {
-                    'page': pagination.page,
-                    'pages': pagination.pages,
-                    'per_page': pagination.per_page,
-                    'total': pagination.total,
-                    'has_next': pagination.has_next,
-                    'has_prev': pagination.has_prev
-                }
+        keyset = 'cursor' in request.args
+        if keyset:
+            # Keyset mode: seek past the previous page instead of OFFSET + COUNT(*)
+            try:
+                rows, next_cursor = keyset_paginate(
+                    query, [Emergency.created_at, Emergency.id],
+                    request.args['cursor'], per_page, descending=True
+                )
+            except ValueError:
+                return create_error_response('Invalid cursor', status_code=400)
+        else:
+            pagination = query.order_by(Emergency.created_at.desc()).paginate(
+                page=page,
+                per_page=per_page,
+                error_out=False
+            )
+            rows = pagination.items
+        
+        if keyset:
+            pagination_data = {
+                'per_page': per_page,
+                'has_next': next_cursor is not None,
+                'next_cursor': next_cursor
+            }
+        else:
+            pagination_data = {
+                'page': pagination.page,
+                'pages': pagination.pages,
+                'per_page': pagination.per_page,
+                'total': pagination.total,
+                'has_next': pagination.has_next,
+                'has_prev': pagination.has_prev
             }
-        )
+        
+        # Resolve the compiled serializer once for the whole page
+        serialize_emergency = model_serializer(Emergency)
+        
+        def generate():
+            # Each row is encoded and sent as it is serialized; the page is never
+            # held as one list of dicts or one JSON string
+            yield b'{"success": true, "message": "Emergencies retrieved successfully", "data": {"emergencies": ['
+            for index, row in enumerate(rows):
+                emergency_data = serialize_emergency(row)
+                
+                hospital = joined_fields(row._mapping, HOSPITAL_SUMMARY_FIELDS, 'hospital')
+                if hospital:
+                    emergency_data['hospital'] = hospital
+                user = joined_fields(row._mapping, USER_SUMMARY_FIELDS, 'user')
+                if user:
+                    emergency_data['user'] = user
+                
+                if index:
+                    yield b','
+                yield orjson.dumps(emergency_data)
+            yield b'], "pagination": ' + orjson.dumps(pagination_data) + b'}}'
+        
+        return Response(stream_with_context(generate()), mimetype='application/json')
         
     except Exception as e:
         return create_error_response(f'Failed to retrieve emergencies: {str(e)}', status_code=500)
@@ -108,7 +189,7 @@ def get_all_emergencies():
 def update_emergency(case_id):
     """Update emergency case status"""
     try:
-        emergency = Emergency.query.get(case_id)
+        emergency = db.session.get(Emergency, case_id)
         if not emergency:
             return create_error_response('Emergency case not found', status_code=404)
         
@@ -123,10 +204,10 @@ def update_emergency(case_id):
         if 'hospital_id' in data:
             emergency.hospital_id = data['hospital_id']
         
+        db.session.flush()
+        emergency_data = serialize_model(emergency)  # before commit expires it
         db.session.commit()
         
-        emergency_data = serialize_model(emergency)
-        
         return create_success_response(
             'Emergency case updated successfully',
             {'emergency': emergency_data}
@@ -139,6 +220,7 @@ def update_emergency(case_id):
 
 @emergency_bp.route('/stats', methods=['GET'])
 @admin_required
+@read_replica
 def get_emergency_stats():
     """Get emergency statistics"""
     try:
@@ -205,13 +287,24 @@ def get_emergency_stats():
 
 
 @emergency_bp.route('/ambulances/available', methods=['GET'])
+@read_replica
 def get_available_ambulances():
     """Get available ambulances"""
     try:
+        # Served from Redis until the TTL lapses or an ambulance write commits. The
+        # version is read once, so a list built before a write is stored under the old one
+        cache_version = AmbulanceCache.get_version()
+        cache_key = query_cache_key(request.args)
+        cached_data = AmbulanceCache.get_available(cache_version, cache_key)
+        if cached_data is not None:
+            return create_success_response('Available ambulances retrieved successfully', cached_data)
+        
         hospital_id = request.args.get('hospital_id', type=int)
         ambulance_type = request.args.get('type')
         
-        query = Ambulance.query.filter_by(status=AmbulanceStatus.VACANT)
+        query = Ambulance.query.options(
+            joinedload(Ambulance.hospital).load_only(*_summary_columns(Hospital, HOSPITAL_SUMMARY_FIELDS))
+        ).filter_by(status=AmbulanceStatus.VACANT)
         
         if hospital_id:
             query = query.filter_by(hospital_id=hospital_id)
@@ -222,10 +315,13 @@ def get_available_ambulances():
         ambulances = []
         for ambulance in query.all():
             ambulance_data = serialize_model(ambulance)
+            # Already joined; hospital_id is nullable for public ambulances
             if ambulance.hospital:
-                ambulance_data['hospital'] = serialize_model(ambulance.hospital)
+                ambulance_data['hospital'] = serialize_model(ambulance.hospital, fields=HOSPITAL_SUMMARY_FIELDS)
             ambulances.append(ambulance_data)
         
+        AmbulanceCache.set_available(cache_version, cache_key, {'ambulances': ambulances})
+        
         return create_success_response(
             'Available ambulances retrieved successfully',
             {'ambulances': ambulances}
@@ -233,3 +329,24 @@ def get_available_ambulances():
         
     except Exception as e:
         return create_error_response(f'Failed to retrieve ambulances: {str(e)}', status_code=500)
+
+
+def _note_ambulance_writes(session, flush_context):
+    """Remember, until the transaction ends, that it flushed ambulance changes"""
+    if any(isinstance(obj, Ambulance) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info['ambulances_written'] = True
+
+
+def _invalidate_available_ambulances(session):
+    """Retire cached fleet listings once ambulance writes commit, whichever code path made them"""
+    if session.info.pop('ambulances_written', False):
+        AmbulanceCache.invalidate_available()
+
+
+def _forget_ambulance_writes(session):
+    session.info.pop('ambulances_written', None)
+
+
+event.listen(db.session, 'after_flush', _note_ambulance_writes)
+event.listen(db.session, 'after_commit', _invalidate_available_ambulances)
+event.listen(db.session, 'after_rollback', _forget_ambulance_writes)
@@ -1,117 +1,151 @@
-from flask import Blueprint, request, jsonify
+import orjson
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from sqlalchemy import delete, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
 from app.models import (
     db, Hospital, Hospital_info, Floor, Ward, WardCategory, Bed,
-    BedStatus, OPDStatus
+    BedStatus
 )
 from app.auth.decorators import admin_required, hospital_admin_or_admin_required
+from app.schemas import (
+    load_payload, HospitalRegisterIn, HospitalUpdateIn,
+    FloorCreateIn, WardCreateIn, BedCreateIn, BedUpdateIn
+)
+from app.services.cache_service import HospitalCache, cache_service, query_cache_key
 from app.utils.helpers import (
-    hash_password, validate_email, serialize_model,
+    hash_password, serialize_model,
     create_success_response, create_error_response,
     generate_hospital_registration_id, check_password,
-    validate_password_strength
+    validate_password_strength, keyset_paginate, parse_per_page, MAX_PER_PAGE, model_serializer, serialize_many,
+    prefixed_columns, joined_fields
 )
 
 hospital_bp = Blueprint('hospital', __name__)
 
+# hospital_info columns embedded in listings; the password hash is never SELECTed
+HOSPITAL_INFO_FIELDS = [column.name for column in Hospital_info.__table__.columns if column.name != 'password']
+
+
+def _floor_owner(floor_id):
+    """(hospital_id, hospital_info_id) for a floor in one joined SELECT, or None"""
+    return db.session.query(Hospital.id, Hospital.hospital_info_id).join(
+        Floor, Floor.hospital_id == Hospital.id
+    ).filter(Floor.id == floor_id).first()
+
+
+def _ward_owner(ward_id):
+    """(hospital_id, hospital_info_id) for a ward in one joined SELECT, or None"""
+    return db.session.query(Hospital.id, Hospital.hospital_info_id).join(
+        Floor, Floor.hospital_id == Hospital.id
+    ).join(
+        Ward, Ward.floor_id == Floor.id
+    ).filter(Ward.id == ward_id).first()
+
+
+def _general_ward_category_id():
+    """Id of the 'General' ward category, created on first use"""
+    category_id = current_app.config.get('GENERAL_WARD_CATEGORY_ID')
+    if category_id:
+        return category_id
+    
+    # The row never changes once it exists, so later registrations skip this SELECT
+    category = WardCategory.query.filter_by(name='General').first()
+    if category:
+        current_app.config['GENERAL_WARD_CATEGORY_ID'] = category.id
+        return category.id
+    
+    # Insert under a SAVEPOINT: if a concurrent registration creates it first, only
+    # this INSERT is rolled back and the registration carries on with their row
+    try:
+        with db.session.begin_nested():
+            category = WardCategory(
+                name='General',
+                description='General ward for regular patients'
+            )
+            db.session.add(category)
+    except IntegrityError:
+        category = WardCategory.query.filter_by(name='General').one()
+    # Not cached yet: a row inserted here is only safe to reuse once this transaction commits
+    return category.id
+
+
+def _duplicate_field(error, fields):
+    """The field a UNIQUE violation names (column or constraint), or None for other IntegrityErrors"""
+    message = str(error.orig)
+    if getattr(error.orig, 'pgcode', None) != '23505' and 'UNIQUE constraint failed' not in message:
+        return None
+    return next((field for field in fields if field in message), None)
+
 
 @hospital_bp.route('/register', methods=['POST'])
 @admin_required
 def register_hospital():
     """Register a new hospital"""
     try:
-        data = request.get_json()
-        
-        # Validate required fields
-        required_fields = ['username', 'name', 'type', 'email', 'password', 'location']
-        for field in required_fields:
-            if not data.get(field):
-                return create_error_response(f'{field} is required', status_code=400)
+        payload, error = load_payload(HospitalRegisterIn, request.get_json())
+        if error:
+            return create_error_response(error, status_code=400)
         
-        # Validate email format
-        if not validate_email(data['email']):
-            return create_error_response('Invalid email format', status_code=400)
-        
-        # Check if hospital already exists
-        if Hospital_info.query.filter_by(username=data['username']).first():
-            return create_error_response('Username already exists', status_code=409)
-        
-        if Hospital_info.query.filter_by(email=data['email']).first():
-            return create_error_response('Email already registered', status_code=409)
-        
-        # Generate registration ID if not provided
-        reg_id = data.get('reg_id') or generate_hospital_registration_id()
-        
-        if Hospital_info.query.filter_by(reg_id=reg_id).first():
-            return create_error_response('Registration ID already exists', status_code=409)
+        # Generate registration ID if not provided. Duplicate usernames, emails and
+        # registration IDs are rejected by their UNIQUE constraints at insert time
+        reg_id = payload.reg_id or generate_hospital_registration_id()
         
         # Hash password
-        hashed_password = hash_password(data['password'])
+        hashed_password = hash_password(payload.password)
         
         # Create hospital info
         hospital_info = Hospital_info(
-            username=data['username'],
-            name=data['name'],
-            type=data['type'],
-            email=data['email'],
+            username=payload.username,
+            name=payload.name,
+            type=payload.type,
+            email=payload.email,
             password=hashed_password,
-            location=data['location'],
-            is_multi_level=data.get('is_multi_level', False),
+            location=payload.location,
+            is_multi_level=payload.is_multi_level,
             reg_id=reg_id,
-            availability=data.get('availability')
+            availability=payload.availability
         )
         
-        # Create associated hospital record
+        # Create associated hospital record. The records are linked through their
+        # relationships, so a single flush orders the INSERTs and fills in the foreign keys
         hospital = Hospital(
-            name=data['name'],
-            location=data['location'],
-            contact_num=data.get('contact_num'),
-            email=data['email'],
-            hospital_type=data['type'],
-            bedAvailability=data.get('bedAvailability', 0),
-            oxygenUnits=data.get('oxygenUnits', 0)
+            name=payload.name,
+            location=payload.location,
+            contact_num=payload.contact_num,
+            email=payload.email,
+            hospital_type=payload.type,
+            bedAvailability=payload.bedAvailability,
+            oxygenUnits=payload.oxygenUnits,
+            hospital_info=hospital_info
         )
         
-        db.session.add(hospital_info)
-        db.session.flush()  # Get the ID
-        
-        hospital.hospital_info_id = hospital_info.id
-        db.session.add(hospital)
-        
         # If single-level hospital, create default floor and ward
         if not hospital_info.is_multi_level:
-            db.session.flush()  # Get hospital ID
+            # Create default ward category if it doesn't exist
+            general_category_id = _general_ward_category_id()
             
             floor = Floor(
                 floor_number='0',
                 floor_name='Ground Floor',
-                hospital_id=hospital.id
+                hospital=hospital
             )
-            db.session.add(floor)
-            db.session.flush()
-            
-            # Create default ward category if it doesn't exist
-            general_category = WardCategory.query.filter_by(name='General').first()
-            if not general_category:
-                general_category = WardCategory(
-                    name='General',
-                    description='General ward for regular patients'
-                )
-                db.session.add(general_category)
-                db.session.flush()
             
             # Create default ward
-            ward = Ward(
+            Ward(
                 ward_number='W1',
-                category_id=general_category.id,
-                capacity=data.get('default_ward_capacity', 10),
-                floor_id=floor.id
+                category_id=general_category_id,
+                capacity=payload.default_ward_capacity,
+                floor=floor
             )
-            db.session.add(ward)
         
+        # Cascades to the hospital, floor and ward
+        db.session.add(hospital_info)
+        db.session.flush()
+        hospital_data = serialize_model(hospital_info, exclude=['password'])  # before commit expires it
         db.session.commit()
-        
-        hospital_data = serialize_model(hospital_info, exclude=['password'])
+        HospitalCache.invalidate_hospital_lists()
         
         return create_success_response(
             'Hospital registered successfully',
@@ -119,6 +153,16 @@ def register_hospital():
             status_code=201
         )
         
+    except IntegrityError as e:
+        db.session.rollback()
+        duplicate = _duplicate_field(e, ['username', 'email', 'reg_id'])
+        if duplicate == 'username':
+            return create_error_response('Username already exists', status_code=409)
+        if duplicate == 'email':
+            return create_error_response('Email already registered', status_code=409)
+        if duplicate == 'reg_id':
+            return create_error_response('Registration ID already exists', status_code=409)
+        return create_error_response(f'Hospital registration failed: {str(e)}', status_code=500)
     except Exception as e:
         db.session.rollback()
         return create_error_response(f'Hospital registration failed: {str(e)}', status_code=500)
@@ -128,12 +172,32 @@ def register_hospital():
 def get_all_hospitals():
     """Get all hospitals"""
     try:
+        # Reject oversized pages before any query or cache lookup
+        try:
+            per_page = parse_per_page(request.args)
+        except ValueError:
+            return create_error_response(f'per_page must be an integer between 1 and {MAX_PER_PAGE}', status_code=400)
+        
+        # Patient-facing UIs poll this listing; repeat queries are served from Redis.
+        # The version is read once, so a page built before a write is stored under the old one
+        cache_version = HospitalCache.get_list_version()
+        cache_key = query_cache_key(request.args)
+        cached_data = HospitalCache.get_hospital_list(cache_version, cache_key)
+        if cached_data is not None:
+            return create_success_response('Hospitals retrieved successfully', cached_data)
+        
         page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
         hospital_type = request.args.get('type')
         location = request.args.get('location')
         
-        query = Hospital.query
+        # One SELECT returns plain rows: the hospital columns plus its one-to-one
+        # hospital_info from an outer join, with no ORM objects built
+        query = db.session.query(
+            *Hospital.__table__.columns,
+            *prefixed_columns(Hospital_info, HOSPITAL_INFO_FIELDS, 'info')
+        ).outerjoin(
+            Hospital_info, Hospital.hospital_info_id == Hospital_info.id
+        )
         
         # Apply filters
         if hospital_type:
@@ -142,43 +206,72 @@ def get_all_hospitals():
         if location:
             query = query.filter(Hospital.location.ilike(f'%{location}%'))
         
-        # Order by name
-        query = query.order_by(Hospital.name)
-        
-        # Paginate
-        pagination = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
-        
-        hospitals = []
-        for hospital in pagination.items:
-            hospital_data = serialize_model(hospital)
-            
-            # Add hospital info if available
-            if hospital.hospital_info:
-                hospital_data['hospital_info'] = serialize_model(
-                    hospital.hospital_info, 
-                    exclude=['password']
+        if 'cursor' in request.args:
+            # Keyset mode: seek past the previous page instead of OFFSET + COUNT(*)
+            try:
+                rows, next_cursor = keyset_paginate(
+                    query, [Hospital.name, Hospital.id],
+                    request.args['cursor'], per_page
                 )
+            except ValueError:
+                return create_error_response('Invalid cursor', status_code=400)
             
-            hospitals.append(hospital_data)
-        
-        return create_success_response(
-            'Hospitals retrieved successfully',
-            {
-                'hospitals': hospitals,
-                'pagination': {
-                    'page': pagination.page,
-                    'pages': pagination.pages,
-                    'per_page': pagination.per_page,
-                    'total': pagination.total,
-                    'has_next': pagination.has_next,
-                    'has_prev': pagination.has_prev
-                }
+            pagination_data = {
+                'per_page': per_page,
+                'has_next': next_cursor is not None,
+                'next_cursor': next_cursor
             }
-        )
+        else:
+            # Order by name
+            query = query.order_by(Hospital.name)
+            
+            # Paginate
+            pagination = query.paginate(
+                page=page,
+                per_page=per_page,
+                error_out=False
+            )
+            
+            rows = pagination.items
+            pagination_data = {
+                'page': pagination.page,
+                'pages': pagination.pages,
+                'per_page': pagination.per_page,
+                'total': pagination.total,
+                'has_next': pagination.has_next,
+                'has_prev': pagination.has_prev
+            }
+        
+        # Look the compiled serializer up once for the whole page
+        serialize_hospital = model_serializer(Hospital)
+        # The page is only kept whole when there is a cache to store it in
+        hospitals = [] if cache_service.is_available() else None
+        
+        def generate():
+            # Each row is encoded and sent as it is serialized, as in /emergency/all
+            yield b'{"success": true, "message": "Hospitals retrieved successfully", "data": {"hospitals": ['
+            for index, row in enumerate(rows):
+                hospital_data = serialize_hospital(row)
+                
+                # Add hospital info if available
+                hospital_info = joined_fields(row._mapping, HOSPITAL_INFO_FIELDS, 'info')
+                if hospital_info:
+                    hospital_data['hospital_info'] = hospital_info
+                
+                if index:
+                    yield b','
+                yield orjson.dumps(hospital_data)
+                if hospitals is not None:
+                    hospitals.append(hospital_data)
+            yield b'], "pagination": ' + orjson.dumps(pagination_data) + b'}}'
+            
+            if hospitals is not None:
+                HospitalCache.set_hospital_list(cache_version, cache_key, {
+                    'hospitals': hospitals,
+                    'pagination': pagination_data
+                })
+        
+        return Response(stream_with_context(generate()), mimetype='application/json')
         
     except Exception as e:
         return create_error_response(f'Failed to retrieve hospitals: {str(e)}', status_code=500)
@@ -188,7 +281,11 @@ def get_all_hospitals():
 def get_hospital(hospital_id):
     """Get hospital details"""
     try:
-        hospital = Hospital.query.get(hospital_id)
+        cached_data = HospitalCache.get_hospital_details(hospital_id)
+        if cached_data is not None:
+            return create_success_response('Hospital details retrieved successfully', cached_data)
+        
+        hospital = db.session.get(Hospital, hospital_id)
         if not hospital:
             return create_error_response('Hospital not found', status_code=404)
         
@@ -201,19 +298,25 @@ def get_hospital(hospital_id):
                 exclude=['password']
             )
         
-        # Add floor and ward counts
-        hospital_data['floor_count'] = hospital.floors.count()
-        hospital_data['total_wards'] = sum(floor.wards.count() for floor in hospital.floors)
-        hospital_data['total_beds'] = sum(
-            bed_count for floor in hospital.floors 
-            for ward in floor.wards 
-            for bed_count in [ward.beds.count()]
-        )
+        # Add floor, ward and bed counts in one aggregate query instead of a COUNT per ward
+        floor_count, ward_count, bed_count = db.session.query(
+            func.count(func.distinct(Floor.id)),
+            func.count(func.distinct(Ward.id)),
+            func.count(Bed.id)
+        ).select_from(Floor).outerjoin(
+            Ward, Ward.floor_id == Floor.id
+        ).outerjoin(
+            Bed, Bed.ward_id == Ward.id
+        ).filter(Floor.hospital_id == hospital_id).one()
         
-        return create_success_response(
-            'Hospital details retrieved successfully',
-            {'hospital': hospital_data}
-        )
+        hospital_data['floor_count'] = floor_count
+        hospital_data['total_wards'] = ward_count
+        hospital_data['total_beds'] = bed_count
+        
+        data = {'hospital': hospital_data}
+        HospitalCache.set_hospital_details(hospital_id, data)
+        
+        return create_success_response('Hospital details retrieved successfully', data)
         
     except Exception as e:
         return create_error_response(f'Failed to retrieve hospital: {str(e)}', status_code=500)
@@ -224,12 +327,12 @@ def get_hospital(hospital_id):
 def update_hospital(hospital_id):
     """Update hospital details"""
     try:
-        hospital = Hospital.query.get(hospital_id)
+        hospital = db.session.get(Hospital, hospital_id)
         if not hospital:
             return create_error_response('Hospital not found', status_code=404)
         
         # Check if current user can update this hospital
-        current_user_id = get_jwt_identity()
+        current_user_id = int(get_jwt_identity())
         claims = get_jwt()
         user_role = claims.get('role')
         user_type = claims.get('type')
@@ -238,53 +341,25 @@ def update_hospital(hospital_id):
         if user_type == 'hospital' and hospital.hospital_info_id != current_user_id:
             return create_error_response('Access denied', status_code=403)
         
-        data = request.get_json()
-        
-        # Update allowed fields
-        if 'name' in data:
-            hospital.name = data['name']
+        payload, error = load_payload(HospitalUpdateIn, request.get_json())
+        if error:
+            return create_error_response(error, status_code=400)
         
-        if 'location' in data:
-            hospital.location = data['location']
+        # Update only the fields the client sent
+        changes = payload.model_dump(exclude_unset=True)
+        info_changes = changes.pop('hospital_info', None)
         
-        if 'contact_num' in data:
-            hospital.contact_num = data['contact_num']
-        
-        if 'hospital_type' in data:
-            hospital.hospital_type = data['hospital_type']
-        
-        if 'bedAvailability' in data:
-            hospital.bedAvailability = data['bedAvailability']
-        
-        if 'oxygenUnits' in data:
-            hospital.oxygenUnits = data['oxygenUnits']
-        
-        if 'opd_status' in data:
-            try:
-                hospital.opd_status = OPDStatus(data['opd_status'])
-            except ValueError:
-                return create_error_response(
-                    f'Invalid OPD status. Allowed values: {[e.value for e in OPDStatus]}',
-                    status_code=400
-                )
+        for field, value in changes.items():
+            setattr(hospital, field, value)
         
         # Update hospital_info if provided and user has permission
-        if hospital.hospital_info and 'hospital_info' in data:
-            info_data = data['hospital_info']
-            
-            if 'name' in info_data:
-                hospital.hospital_info.name = info_data['name']
-            
-            if 'type' in info_data:
-                hospital.hospital_info.type = info_data['type']
-            
-            if 'location' in info_data:
-                hospital.hospital_info.location = info_data['location']
-            
-            if 'availability' in info_data:
-                hospital.hospital_info.availability = info_data['availability']
+        if hospital.hospital_info and info_changes:
+            for field, value in info_changes.items():
+                setattr(hospital.hospital_info, field, value)
         
         db.session.commit()
+        HospitalCache.invalidate_hospital_data(hospital_id)
+        HospitalCache.invalidate_hospital_lists()
         
         hospital_data = serialize_model(hospital)
         if hospital.hospital_info:
@@ -308,20 +383,25 @@ def update_hospital(hospital_id):
 def delete_hospital(hospital_id):
     """Delete hospital (admin only)"""
     try:
-        hospital = Hospital.query.get(hospital_id)
+        hospital = db.session.query(Hospital.name, Hospital.hospital_info_id).filter(
+            Hospital.id == hospital_id
+        ).first()
         if not hospital:
             return create_error_response('Hospital not found', status_code=404)
         
-        hospital_name = hospital.name
+        # One DELETE for the hospital: the ON DELETE CASCADE foreign keys remove its
+        # floors, wards, beds, OPDs and inventory without loading them
+        db.session.execute(delete(Hospital).where(Hospital.id == hospital_id))
         
         # Delete associated hospital_info as well
-        if hospital.hospital_info:
-            db.session.delete(hospital.hospital_info)
+        if hospital.hospital_info_id:
+            db.session.execute(delete(Hospital_info).where(Hospital_info.id == hospital.hospital_info_id))
         
-        db.session.delete(hospital)
         db.session.commit()
+        HospitalCache.invalidate_hospital_data(hospital_id)
+        HospitalCache.invalidate_hospital_lists()
         
-        return create_success_response(f'Hospital "{hospital_name}" deleted successfully')
+        return create_success_response(f'Hospital "{hospital.name}" deleted successfully')
         
     except Exception as e:
         db.session.rollback()
@@ -335,12 +415,17 @@ def delete_hospital(hospital_id):
 def create_floor(hospital_id):
     """Create a new floor for a hospital"""
     try:
-        hospital = Hospital.query.get(hospital_id)
+        # Owner and multi-level flag in one SELECT, without loading either row
+        hospital = db.session.query(
+            Hospital.hospital_info_id, Hospital_info.is_multi_level
+        ).outerjoin(
+            Hospital_info, Hospital.hospital_info_id == Hospital_info.id
+        ).filter(Hospital.id == hospital_id).first()
         if not hospital:
             return create_error_response('Hospital not found', status_code=404)
         
         # Check if current user can manage this hospital
-        current_user_id = get_jwt_identity()
+        current_user_id = int(get_jwt_identity())
         claims = get_jwt()
         user_type = claims.get('type')
         
@@ -348,34 +433,26 @@ def create_floor(hospital_id):
             return create_error_response('Access denied', status_code=403)
         
         # Check if hospital is multi-level
-        if hospital.hospital_info and not hospital.hospital_info.is_multi_level:
+        if hospital.hospital_info_id and not hospital.is_multi_level:
             return create_error_response(
                 'Cannot create multiple floors for single-level hospital',
                 status_code=400
             )
         
-        data = request.get_json()
-        
-        if not data.get('floor_number'):
-            return create_error_response('Floor number is required', status_code=400)
-        
-        # Check if floor already exists
-        existing_floor = Floor.query.filter_by(
-            hospital_id=hospital_id,
-            floor_number=data['floor_number']
-        ).first()
-        
-        if existing_floor:
-            return create_error_response('Floor number already exists', status_code=409)
+        payload, error = load_payload(FloorCreateIn, request.get_json())
+        if error:
+            return create_error_response(error, status_code=400)
         
+        # A repeated floor number is rejected by uq_hospital_floor_number on insert
         floor = Floor(
-            floor_number=data['floor_number'],
-            floor_name=data.get('floor_name'),
+            floor_number=payload.floor_number,
+            floor_name=payload.floor_name,
             hospital_id=hospital_id
         )
         
         db.session.add(floor)
         db.session.commit()
+        HospitalCache.invalidate_hospital_data(hospital_id)
         
         floor_data = serialize_model(floor)
         
@@ -385,6 +462,11 @@ def create_floor(hospital_id):
             status_code=201
         )
         
+    except IntegrityError as e:
+        db.session.rollback()
+        if _duplicate_field(e, ['floor_number']):
+            return create_error_response('Floor number already exists', status_code=409)
+        return create_error_response(f'Floor creation failed: {str(e)}', status_code=500)
     except Exception as e:
         db.session.rollback()
         return create_error_response(f'Floor creation failed: {str(e)}', status_code=500)
@@ -394,20 +476,30 @@ def create_floor(hospital_id):
 def get_hospital_floors(hospital_id):
     """Get all floors of a hospital"""
     try:
-        hospital = Hospital.query.get(hospital_id)
+        cached_data = HospitalCache.get_floors(hospital_id)
+        if cached_data is not None:
+            return create_success_response('Hospital floors retrieved successfully', cached_data)
+        
+        # Floors and their wards arrive in two IN queries rather than a COUNT per floor
+        hospital = db.session.get(
+            Hospital, hospital_id,
+            options=[selectinload(Hospital.floors).selectinload(Floor.wards)]
+        )
         if not hospital:
             return create_error_response('Hospital not found', status_code=404)
         
+        serialize_floor = model_serializer(Floor)
+        
         floors = []
-        for floor in hospital.floors.order_by(Floor.floor_number):
-            floor_data = serialize_model(floor)
-            floor_data['ward_count'] = floor.wards.count()
+        for floor in sorted(hospital.floors, key=lambda floor: floor.floor_number):
+            floor_data = serialize_floor(floor)
+            floor_data['ward_count'] = len(floor.wards)
             floors.append(floor_data)
         
-        return create_success_response(
-            'Hospital floors retrieved successfully',
-            {'floors': floors}
-        )
+        data = {'floors': floors}
+        HospitalCache.set_floors(hospital_id, data)
+        
+        return create_success_response('Hospital floors retrieved successfully', data)
         
     except Exception as e:
         return create_error_response(f'Failed to retrieve floors: {str(e)}', status_code=500)
@@ -420,43 +512,28 @@ def get_hospital_floors(hospital_id):
 def create_ward():
     """Create a ward"""
     try:
-        data = request.get_json()
-        
-        required_fields = ['ward_number', 'floor_id', 'capacity']
-        for field in required_fields:
-            if field not in data:
-                return create_error_response(f'{field} is required', status_code=400)
+        payload, error = load_payload(WardCreateIn, request.get_json())
+        if error:
+            return create_error_response(error, status_code=400)
         
-        floor = Floor.query.get(data['floor_id'])
-        if not floor:
+        owner = _floor_owner(payload.floor_id)
+        if not owner:
             return create_error_response('Floor not found', status_code=404)
         
         # Check permissions
-        current_user_id = get_jwt_identity()
+        current_user_id = int(get_jwt_identity())
         claims = get_jwt()
         user_type = claims.get('type')
         
-        if user_type == 'hospital' and floor.hospital.hospital_info_id != current_user_id:
+        if user_type == 'hospital' and owner.hospital_info_id != current_user_id:
             return create_error_response('Access denied', status_code=403)
         
-        # Check if ward number already exists on this floor
-        existing_ward = Ward.query.filter_by(
-            floor_id=data['floor_id'],
-            ward_number=data['ward_number']
-        ).first()
-        
-        if existing_ward:
-            return create_error_response('Ward number already exists on this floor', status_code=409)
-        
-        ward = Ward(
-            ward_number=data['ward_number'],
-            category_id=data.get('category_id'),
-            capacity=data['capacity'],
-            floor_id=data['floor_id']
-        )
+        # A repeated ward number on the floor is rejected by uq_floor_ward_number on insert
+        ward = Ward(**payload.model_dump())
         
         db.session.add(ward)
         db.session.commit()
+        HospitalCache.invalidate_hospital_data(owner.id)
         
         ward_data = serialize_model(ward)
         if ward.category:
@@ -468,6 +545,11 @@ def create_ward():
             status_code=201
         )
         
+    except IntegrityError as e:
+        db.session.rollback()
+        if _duplicate_field(e, ['ward_number']):
+            return create_error_response('Ward number already exists on this floor', status_code=409)
+        return create_error_response(f'Ward creation failed: {str(e)}', status_code=500)
     except Exception as e:
         db.session.rollback()
         return create_error_response(f'Ward creation failed: {str(e)}', status_code=500)
@@ -477,7 +559,7 @@ def create_ward():
 def get_ward(ward_id):
     """Get ward details"""
     try:
-        ward = Ward.query.get(ward_id)
+        ward = db.session.get(Ward, ward_id)
         if not ward:
             return create_error_response('Ward not found', status_code=404)
         
@@ -489,9 +571,7 @@ def get_ward(ward_id):
         if ward.floor:
             ward_data['floor'] = serialize_model(ward.floor)
         
-        ward_data['bed_count'] = ward.beds.count()
-        ward_data['occupied_beds'] = ward.beds.filter_by(status=BedStatus.OCCUPIED).count()
-        ward_data['available_beds'] = ward.beds.filter_by(status=BedStatus.VACANT).count()
+        # bed_count, occupied_beds and available_beds are the trigger-maintained counters
         
         return create_success_response(
             'Ward details retrieved successfully',
@@ -506,18 +586,26 @@ def get_ward(ward_id):
 def get_hospital_wards(hospital_id):
     """Get all wards of a hospital"""
     try:
-        hospital = Hospital.query.get(hospital_id)
+        hospital = db.session.get(
+            Hospital, hospital_id,
+            options=[
+                selectinload(Hospital.floors).selectinload(Floor.wards).selectinload(Ward.category)
+            ]
+        )
         if not hospital:
             return create_error_response('Hospital not found', status_code=404)
         
+        serialize_ward = model_serializer(Ward)
+        serialize_category = model_serializer(WardCategory)
+        
         wards = []
         for floor in hospital.floors:
+            floor_data = serialize_model(floor)  # shared by every ward on the floor
             for ward in floor.wards:
-                ward_data = serialize_model(ward)
-                ward_data['floor'] = serialize_model(floor)
+                ward_data = serialize_ward(ward)
+                ward_data['floor'] = floor_data
                 if ward.category:
-                    ward_data['category'] = serialize_model(ward.category)
-                ward_data['bed_count'] = ward.beds.count()
+                    ward_data['category'] = serialize_category(ward.category)
                 wards.append(ward_data)
         
         return create_success_response(
@@ -536,41 +624,33 @@ def get_hospital_wards(hospital_id):
 def create_bed(ward_id):
     """Add a bed to a ward"""
     try:
-        ward = Ward.query.get(ward_id)
-        if not ward:
+        owner = _ward_owner(ward_id)
+        if not owner:
             return create_error_response('Ward not found', status_code=404)
         
         # Check permissions
-        current_user_id = get_jwt_identity()
+        current_user_id = int(get_jwt_identity())
         claims = get_jwt()
         user_type = claims.get('type')
         
-        if user_type == 'hospital' and ward.floor.hospital.hospital_info_id != current_user_id:
+        if user_type == 'hospital' and owner.hospital_info_id != current_user_id:
             return create_error_response('Access denied', status_code=403)
         
-        data = request.get_json()
-        
-        if not data.get('bed_number'):
-            return create_error_response('Bed number is required', status_code=400)
-        
-        # Check if bed number already exists in this ward
-        existing_bed = Bed.query.filter_by(
-            ward_id=ward_id,
-            bed_number=data['bed_number']
-        ).first()
-        
-        if existing_bed:
-            return create_error_response('Bed number already exists in this ward', status_code=409)
+        payload, error = load_payload(BedCreateIn, request.get_json())
+        if error:
+            return create_error_response(error, status_code=400)
         
+        # A repeated bed number in the ward is rejected by uq_ward_bed_number on insert
         bed = Bed(
             ward_id=ward_id,
-            bed_number=data['bed_number'],
-            bed_type=data.get('bed_type', 'General'),
+            bed_number=payload.bed_number,
+            bed_type=payload.bed_type,
             status=BedStatus.VACANT
         )
         
         db.session.add(bed)
         db.session.commit()
+        HospitalCache.invalidate_hospital_data(owner.id)
         
         bed_data = serialize_model(bed)
         
@@ -580,6 +660,11 @@ def create_bed(ward_id):
             status_code=201
         )
         
+    except IntegrityError as e:
+        db.session.rollback()
+        if _duplicate_field(e, ['bed_number']):
+            return create_error_response('Bed number already exists in this ward', status_code=409)
+        return create_error_response(f'Bed creation failed: {str(e)}', status_code=500)
     except Exception as e:
         db.session.rollback()
         return create_error_response(f'Bed creation failed: {str(e)}', status_code=500)
@@ -589,13 +674,11 @@ def create_bed(ward_id):
 def get_ward_beds(ward_id):
     """Get all beds in a ward"""
     try:
-        ward = Ward.query.get(ward_id)
+        ward = db.session.get(Ward, ward_id)
         if not ward:
             return create_error_response('Ward not found', status_code=404)
         
-        beds = []
-        for bed in ward.beds.order_by(Bed.bed_number):
-            beds.append(serialize_model(bed))
+        beds = serialize_many(Bed, Bed.query.filter_by(ward_id=ward_id).order_by(Bed.bed_number))
         
         return create_success_response(
             'Ward beds retrieved successfully',
@@ -610,7 +693,7 @@ def get_ward_beds(ward_id):
 def get_bed(bed_id):
     """Get bed details"""
     try:
-        bed = Bed.query.get(bed_id)
+        bed = db.session.get(Bed, bed_id)
         if not bed:
             return create_error_response('Bed not found', status_code=404)
         
@@ -631,33 +714,36 @@ def get_bed(bed_id):
 def update_bed(bed_id):
     """Update bed details"""
     try:
-        bed = Bed.query.get(bed_id)
-        if not bed:
+        # The bed and its owning hospital come back together from one joined SELECT
+        row = db.session.query(Bed, Hospital.id, Hospital.hospital_info_id).join(
+            Ward, Bed.ward_id == Ward.id
+        ).join(
+            Floor, Ward.floor_id == Floor.id
+        ).join(
+            Hospital, Floor.hospital_id == Hospital.id
+        ).filter(Bed.id == bed_id).first()
+        if not row:
             return create_error_response('Bed not found', status_code=404)
         
+        bed, hospital_id, owner_id = row
+        
         # Check permissions
-        current_user_id = get_jwt_identity()
+        current_user_id = int(get_jwt_identity())
         claims = get_jwt()
         user_type = claims.get('type')
         
-        if user_type == 'hospital' and bed.ward.floor.hospital.hospital_info_id != current_user_id:
+        if user_type == 'hospital' and owner_id != current_user_id:
             return create_error_response('Access denied', status_code=403)
         
-        data = request.get_json()
-        
-        if 'status' in data:
-            try:
-                bed.status = BedStatus(data['status'])
-            except ValueError:
-                return create_error_response(
-                    f'Invalid bed status. Allowed values: {[e.value for e in BedStatus]}',
-                    status_code=400
-                )
+        payload, error = load_payload(BedUpdateIn, request.get_json())
+        if error:
+            return create_error_response(error, status_code=400)
         
-        if 'bed_type' in data:
-            bed.bed_type = data['bed_type']
+        for field, value in payload.model_dump(exclude_unset=True).items():
+            setattr(bed, field, value)
         
         db.session.commit()
+        HospitalCache.invalidate_hospital_data(hospital_id)
         
         bed_data = serialize_model(bed)
         
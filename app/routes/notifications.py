@@ -1,17 +1,57 @@
+from datetime import datetime
 from flask import Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
-from app.models import db, Notification
-from app.services.email_service import email_service
+from sqlalchemy import func, select
+from app.models import db, Notification, Users
+from app.services.email_queue import email_outbox
 from app.services.websocket_service import websocket_service
 from app.auth.decorators import admin_required
-from app.utils.helpers import create_success_response, create_error_response, serialize_model
-from app.services.cache_service import cache_service
+from app.utils.helpers import (
+    create_success_response, create_error_response, serialize_many,
+    prebuilt_success_response, send_cacheable
+)
+from app.services.cache_service import NotificationCache, cache_service, cached_response
 
 notifications_bp = Blueprint('notifications', __name__)
 
 
+def _create_notifications(user_ids, title, body, metadata):
+    """
+    Add one in-app notification per user id to the session.
+    Returns the WebSocket payload shared by all of them; the caller commits.
+    """
+    # One timestamp for the whole batch, formatted once for the payload
+    now = datetime.utcnow()
+    notifications = [
+        Notification(user_id=user_id, title=title, body=body, meta_info=metadata, read=False, created_at=now)
+        for user_id in user_ids
+    ]
+    db.session.add_all(notifications)
+    
+    # One flush inserts every row
+    db.session.flush()
+    return {
+        'title': title,
+        'body': body,
+        'metadata': metadata,
+        'created_at': now.isoformat()
+    }
+
+
+def _recipient_columns(send_email):
+    """Users columns a send needs: the address only when emailing, otherwise just the id"""
+    return (Users.id, Users.email, Users.fullname) if send_email else (Users.id,)
+
+
+def _send_emails(recipients, title, body):
+    """Queue the notification emails for the outbox worker, or send them inline without it"""
+    if email_outbox.enqueue(recipients, title, body) is None:
+        email_outbox.send(recipients, title, body)
+
+
 @notifications_bp.route('/my-notifications', methods=['GET'])
 @jwt_required()
+@cached_response('notifications', ttl=10)
 def get_my_notifications():
     """Get notifications for current user"""
     try:
@@ -20,10 +60,13 @@ def get_my_notifications():
         per_page = request.args.get('per_page', default=20, type=int)
         unread_only = request.args.get('unread_only', default=False, type=bool)
         
-        query = Notification.query.filter_by(user_id=current_user_id)
+        # Plain column rows: a read-only page needs no ORM instances or identity map
+        query = db.session.query(*Notification.__table__.columns).filter(
+            Notification.user_id == current_user_id
+        )
         
         if unread_only:
-            query = query.filter_by(read=False)
+            query = query.filter(Notification.read.is_(False))
         
         query = query.order_by(Notification.created_at.desc())
         
@@ -33,14 +76,10 @@ def get_my_notifications():
             error_out=False
         )
         
-        notifications = []
-        for notification in pagination.items:
-            notifications.append(serialize_model(notification))
-        
         return create_success_response(
             'Notifications retrieved successfully',
             {
-                'notifications': notifications,
+                'notifications': serialize_many(Notification, pagination.items),
                 'pagination': {
                     'page': pagination.page,
                     'pages': pagination.pages,
@@ -71,9 +110,14 @@ def mark_notification_read(notification_id):
         if not notification:
             return create_error_response('Notification not found', status_code=404)
         
+        was_unread = not notification.read
         notification.read = True
         db.session.commit()
         
+        if was_unread:
+            NotificationCache.adjust_unread_count(current_user_id, -1)
+        NotificationCache.invalidate_user_list(current_user_id)
+        
         return create_success_response('Notification marked as read')
         
     except Exception as e:
@@ -94,6 +138,8 @@ def mark_all_notifications_read():
         ).update({Notification.read: True})
         
         db.session.commit()
+        NotificationCache.reset_unread_count(current_user_id)
+        NotificationCache.invalidate_user_list(current_user_id)
         
         return create_success_response('All notifications marked as read')
         
@@ -109,18 +155,17 @@ def get_unread_count():
     try:
         current_user_id = get_jwt_identity()
         
-        # Try to get from cache first
-        cache_key = f"unread_count:{current_user_id}"
-        unread_count = cache_service.get(cache_key)
+        # The cached counter is kept current by the send, read and delete routes
+        unread_count, generation = NotificationCache.get_unread_count(current_user_id)
         
         if unread_count is None:
-            unread_count = Notification.query.filter_by(
-                user_id=current_user_id,
-                read=False
-            ).count()
+            # COUNT straight off the partial unread index, without Query.count()'s subquery
+            unread_count = db.session.query(func.count(Notification.id)).filter(
+                Notification.user_id == current_user_id,
+                Notification.read.is_(False)
+            ).scalar()
             
-            # Cache for 5 minutes
-            cache_service.set(cache_key, unread_count, 300)
+            NotificationCache.seed_unread_count(current_user_id, unread_count, generation)
         
         return create_success_response(
             'Unread count retrieved successfully',
@@ -131,6 +176,59 @@ def get_unread_count():
         return create_error_response(f'Failed to get unread count: {str(e)}', status_code=500)
 
 
+def _send_notifications_bulk(title, body, user_ids, send_email, send_websocket, metadata):
+    """Notify the given users and build the /send response; the caller rolls back on error"""
+    # Accept ids sent as strings; entries that are not ids count as failed
+    requested_ids = []
+    invalid_count = 0
+    for user_id in user_ids:
+        try:
+            requested_ids.append(int(user_id))
+        except (TypeError, ValueError):
+            invalid_count += 1
+    
+    # Each user is notified once, in the order first requested
+    requested_ids = list(dict.fromkeys(requested_ids))
+    
+    # Verify the users exist with one IN query, as plain rows rather than Users instances
+    users = {
+        row.id: row
+        for row in db.session.execute(select(*_recipient_columns(send_email)).where(Users.id.in_(requested_ids)))
+    }
+    
+    recipients = [users[user_id] for user_id in requested_ids if user_id in users]
+    recipient_ids = [user.id for user in recipients]
+    total_requested = len(requested_ids) + invalid_count
+    failed_count = total_requested - len(recipients)
+    
+    payload = _create_notifications(recipient_ids, title, body, metadata)
+    
+    email_recipients = [[user.email, user.fullname] for user in recipients if user.email] if send_email else []
+    
+    db.session.commit()
+    
+    # Count the new unread notifications and retire the recipients' cached pages
+    NotificationCache.adjust_unread_counts(recipient_ids, 1)
+    NotificationCache.invalidate_user_lists(recipient_ids)
+    sent_count = len(recipient_ids)
+    
+    # Announce the notifications only once they are committed: one emit reaches every recipient
+    if send_websocket and websocket_service:
+        websocket_service.emit_to_users(recipient_ids, 'new_notification', payload)
+    
+    if email_recipients:
+        _send_emails(email_recipients, title, body)
+    
+    return create_success_response(
+        f'Notifications sent successfully. Sent: {sent_count}, Failed: {failed_count}',
+        {
+            'sent_count': sent_count,
+            'failed_count': failed_count,
+            'total_requested': total_requested
+        }
+    )
+
+
 @notifications_bp.route('/send', methods=['POST'])
 @admin_required
 def send_notification():
@@ -153,70 +251,7 @@ def send_notification():
         if not user_ids:
             return create_error_response('At least one user ID is required', status_code=400)
         
-        sent_count = 0
-        failed_count = 0
-        
-        for user_id in user_ids:
-            try:
-                # Verify user exists before creating notification
-                from app.models import Users
-                user = Users.query.get(user_id)
-                if not user:
-                    failed_count += 1
-                    continue
-                
-                # Create in-app notification
-                notification = Notification(
-                    user_id=user_id,
-                    title=title,
-                    body=body,
-                    metadata=metadata,
-                    read=False
-                )
-                db.session.add(notification)
-                
-                # Send WebSocket notification if requested
-                if send_websocket and websocket_service:
-                    websocket_service.emit_to_user(user_id, 'new_notification', {
-                        'id': notification.id,
-                        'title': title,
-                        'body': body,
-                        'metadata': metadata,
-                        'created_at': notification.created_at.isoformat()
-                    })
-                
-                # Send email notification if requested
-                if send_email:
-                    # User already fetched above
-                    if user and user.email:
-                        email_service.send_notification_and_email(
-                            user_email=user.email,
-                            user_id=user_id,
-                            user_name=user.fullname,
-                            subject=title,
-                            email_body=body,
-                            notification_metadata=metadata
-                        )
-                
-                # Invalidate unread count cache
-                cache_service.delete(f"unread_count:{user_id}")
-                
-                sent_count += 1
-                
-            except Exception as e:
-                failed_count += 1
-                continue
-        
-        db.session.commit()
-        
-        return create_success_response(
-            f'Notifications sent successfully. Sent: {sent_count}, Failed: {failed_count}',
-            {
-                'sent_count': sent_count,
-                'failed_count': failed_count,
-                'total_requested': len(user_ids)
-            }
-        )
+        return _send_notifications_bulk(title, body, user_ids, send_email, send_websocket, metadata)
         
     except Exception as e:
         db.session.rollback()
@@ -242,62 +277,34 @@ def broadcast_notification():
         send_websocket = data.get('send_websocket', True)
         metadata = data.get('metadata', {})
         
-        # Get target users
-        from app.models import Users
-        
-        query = Users.query
+        # Get target users as plain rows, with addresses only when emailing
+        query = select(*_recipient_columns(send_email))
         if target_roles:
-            query = query.filter(Users.role.in_(target_roles))
+            query = query.where(Users.role.in_(target_roles))
         
-        target_users = query.all()
+        target_users = db.session.execute(query).all()
+        recipient_ids = [user.id for user in target_users]
         
-        sent_count = 0
         failed_count = 0
         
-        for user in target_users:
-            try:
-                # Create in-app notification
-                notification = Notification(
-                    user_id=user.id,
-                    title=title,
-                    body=body,
-                    metadata=metadata,
-                    read=False
-                )
-                db.session.add(notification)
-                
-                # Send WebSocket notification if requested
-                if send_websocket and websocket_service:
-                    websocket_service.emit_to_user(user.id, 'new_notification', {
-                        'id': notification.id,
-                        'title': title,
-                        'body': body,
-                        'metadata': metadata,
-                        'created_at': notification.created_at.isoformat()
-                    })
-                
-                # Send email notification if requested
-                if send_email and user.email:
-                    email_service.send_notification_and_email(
-                        user_email=user.email,
-                        user_id=user.id,
-                        user_name=user.fullname,
-                        subject=title,
-                        email_body=body,
-                        notification_metadata=metadata
-                    )
-                
-                # Invalidate unread count cache
-                cache_service.delete(f"unread_count:{user.id}")
-                
-                sent_count += 1
-                
-            except Exception as e:
-                failed_count += 1
-                continue
+        payload = _create_notifications(recipient_ids, title, body, metadata)
+        
+        email_recipients = [[user.email, user.fullname] for user in target_users if user.email] if send_email else []
         
         db.session.commit()
         
+        # Count the new unread notifications and retire the recipients' cached pages
+        NotificationCache.adjust_unread_counts(recipient_ids, 1)
+        NotificationCache.invalidate_user_lists(recipient_ids)
+        sent_count = len(recipient_ids)
+        
+        # Announce the notifications only once they are committed: one emit reaches every recipient
+        if send_websocket and websocket_service:
+            websocket_service.emit_to_users(recipient_ids, 'new_notification', payload)
+        
+        if email_recipients:
+            _send_emails(email_recipients, title, body)
+        
         # Also send WebSocket system notification
         if send_websocket and websocket_service:
             websocket_service.emit_system_notification({
@@ -322,56 +329,59 @@ def broadcast_notification():
         return create_error_response(f'Failed to broadcast notification: {str(e)}', status_code=500)
 
 
+NOTIFICATION_TEMPLATES = [
+    {
+        'id': 'appointment_reminder',
+        'name': 'Appointment Reminder',
+        'title': 'Appointment Reminder - {appointment_date}',
+        'body': 'You have an appointment scheduled for {appointment_date} with Dr. {doctor_name}. Please arrive 15 minutes early.',
+        'category': 'appointments'
+    },
+    {
+        'id': 'blood_request_approved',
+        'name': 'Blood Request Approved',
+        'title': 'Blood Request Approved',
+        'body': 'Your blood request for {blood_type} has been approved. Please visit the blood bank to collect.',
+        'category': 'blood_bank'
+    },
+    {
+        'id': 'emergency_alert',
+        'name': 'Emergency Alert',
+        'title': 'Emergency Alert - {emergency_type}',
+        'body': 'Emergency reported at {location}. Please respond immediately.',
+        'category': 'emergency'
+    },
+    {
+        'id': 'system_maintenance',
+        'name': 'System Maintenance',
+        'title': 'Scheduled System Maintenance',
+        'body': 'The system will be under maintenance from {start_time} to {end_time}. Please save your work.',
+        'category': 'system'
+    },
+    {
+        'id': 'password_expiry',
+        'name': 'Password Expiry Warning',
+        'title': 'Password Expires Soon',
+        'body': 'Your password will expire in {days} days. Please change it to maintain account security.',
+        'category': 'security'
+    }
+]
+
+_TEMPLATES_BY_ID = {template['id']: template for template in NOTIFICATION_TEMPLATES}
+
+# Constant payload: serialized once at import instead of on every request
+_TEMPLATES_BODY, _TEMPLATES_ETAG = prebuilt_success_response(
+    'Notification templates retrieved successfully',
+    {'templates': NOTIFICATION_TEMPLATES}
+)
+
+
 @notifications_bp.route('/templates', methods=['GET'])
 @admin_required
 def get_notification_templates():
     """Get notification templates"""
-    try:
-        templates = [
-            {
-                'id': 'appointment_reminder',
-                'name': 'Appointment Reminder',
-                'title': 'Appointment Reminder - {appointment_date}',
-                'body': 'You have an appointment scheduled for {appointment_date} with Dr. {doctor_name}. Please arrive 15 minutes early.',
-                'category': 'appointments'
-            },
-            {
-                'id': 'blood_request_approved',
-                'name': 'Blood Request Approved',
-                'title': 'Blood Request Approved',
-                'body': 'Your blood request for {blood_type} has been approved. Please visit the blood bank to collect.',
-                'category': 'blood_bank'
-            },
-            {
-                'id': 'emergency_alert',
-                'name': 'Emergency Alert',
-                'title': 'Emergency Alert - {emergency_type}',
-                'body': 'Emergency reported at {location}. Please respond immediately.',
-                'category': 'emergency'
-            },
-            {
-                'id': 'system_maintenance',
-                'name': 'System Maintenance',
-                'title': 'Scheduled System Maintenance',
-                'body': 'The system will be under maintenance from {start_time} to {end_time}. Please save your work.',
-                'category': 'system'
-            },
-            {
-                'id': 'password_expiry',
-                'name': 'Password Expiry Warning',
-                'title': 'Password Expires Soon',
-                'body': 'Your password will expire in {days} days. Please change it to maintain account security.',
-                'category': 'security'
-            }
-        ]
-        
-        return create_success_response(
-            'Notification templates retrieved successfully',
-            {'templates': templates}
-        )
-        
-    except Exception as e:
-        return create_error_response(f'Failed to retrieve templates: {str(e)}', status_code=500)
+    # Admin-only, so browsers may reuse it but shared caches must not
+    return send_cacheable(_TEMPLATES_BODY, _TEMPLATES_ETAG, 'application/json', max_age=3600, public=False)
 
 
 @notifications_bp.route('/send-template', methods=['POST'])
@@ -393,18 +403,7 @@ def send_template_notification():
         send_websocket = data.get('send_websocket', True)
         
         # Get template (this would normally be from database)
-        templates = {
-            'appointment_reminder': {
-                'title': 'Appointment Reminder - {appointment_date}',
-                'body': 'You have an appointment scheduled for {appointment_date} with Dr. {doctor_name}. Please arrive 15 minutes early.'
-            },
-            'blood_request_approved': {
-                'title': 'Blood Request Approved',
-                'body': 'Your blood request for {blood_type} has been approved. Please visit the blood bank to collect.'
-            }
-        }
-        
-        template = templates.get(template_id)
+        template = _TEMPLATES_BY_ID.get(template_id)
         if not template:
             return create_error_response('Template not found', status_code=404)
         
@@ -415,23 +414,15 @@ def send_template_notification():
         except KeyError as e:
             return create_error_response(f'Missing variable: {str(e)}', status_code=400)
         
-        # Send notifications
-        notification_data = {
-            'title': title,
-            'body': body,
-            'user_ids': user_ids,
-            'send_email': send_email,
-            'send_websocket': send_websocket,
-            'metadata': {
-                'template_id': template_id,
-                'variables': variables
-            }
+        metadata = {
+            'template_id': template_id,
+            'variables': variables
         }
         
-        # Reuse the send_notification logic
-        return send_notification()
+        return _send_notifications_bulk(title, body, user_ids, send_email, send_websocket, metadata)
         
     except Exception as e:
+        db.session.rollback()
         return create_error_response(f'Failed to send template notification: {str(e)}', status_code=500)
 
 
@@ -450,11 +441,13 @@ def delete_notification(notification_id):
         if not notification:
             return create_error_response('Notification not found', status_code=404)
         
+        was_unread = not notification.read
         db.session.delete(notification)
         db.session.commit()
         
-        # Invalidate unread count cache
-        cache_service.delete(f"unread_count:{current_user_id}")
+        if was_unread:
+            NotificationCache.adjust_unread_count(current_user_id, -1)
+        NotificationCache.invalidate_user_list(current_user_id)
         
         return create_success_response('Notification deleted successfully')
         
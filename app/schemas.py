@@ -0,0 +1,161 @@
+# schemas.py
+from datetime import date, time
+from typing import Annotated, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, StringConstraints, ValidationError
+
+from app.models import BedStatus, OPDStatus
+
+# Non-empty string, mirroring the `if not data.get(field)` checks it replaces
+RequiredStr = Annotated[str, StringConstraints(min_length=1)]
+
+
+def load_payload(schema, data):
+    """
+    Validate request data against a schema.
+    Returns (payload, None) on success or (None, error message) on failure.
+    """
+    try:
+        return schema.model_validate(data if data is not None else {}), None
+    except ValidationError as e:
+        error = e.errors()[0]
+        field = '.'.join(str(part) for part in error['loc']) or 'body'
+
+        if error['type'] == 'missing' or error.get('input') in (None, ''):
+            return None, f'{field} is required'
+        return None, f'Invalid {field}: {error["msg"]}'
+
+
+# ---------------------------
+# HOSPITALS / FLOORS / WARDS / BEDS
+# ---------------------------
+class HospitalRegisterIn(BaseModel):
+    username: RequiredStr
+    name: RequiredStr
+    type: RequiredStr
+    email: EmailStr
+    password: RequiredStr
+    location: RequiredStr
+    reg_id: Optional[str] = None
+    is_multi_level: bool = False
+    availability: Optional[str] = None
+    contact_num: Optional[str] = None
+    bedAvailability: Optional[int] = 0
+    oxygenUnits: Optional[int] = 0
+    default_ward_capacity: int = 10
+
+
+class HospitalInfoUpdateIn(BaseModel):
+    name: Optional[str] = None
+    type: Optional[str] = None
+    location: Optional[str] = None
+    availability: Optional[str] = None
+
+
+class HospitalUpdateIn(BaseModel):
+    # Handlers apply only the fields the client sent (model_dump(exclude_unset=True))
+    name: Optional[str] = None
+    location: Optional[str] = None
+    contact_num: Optional[str] = None
+    hospital_type: Optional[str] = None
+    bedAvailability: Optional[int] = None
+    oxygenUnits: Optional[int] = None
+    opd_status: Optional[OPDStatus] = None
+    hospital_info: Optional[HospitalInfoUpdateIn] = None
+
+
+class FloorCreateIn(BaseModel):
+    # Floor, ward and bed numbers are labels; accept 1 as well as "1"
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    floor_number: RequiredStr
+    floor_name: Optional[str] = None
+
+
+class WardCreateIn(BaseModel):
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    ward_number: RequiredStr
+    floor_id: int
+    capacity: int
+    category_id: Optional[int] = None
+
+
+class BedCreateIn(BaseModel):
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    bed_number: RequiredStr
+    bed_type: Optional[str] = 'General'
+
+
+class BedUpdateIn(BaseModel):
+    status: Optional[BedStatus] = None
+    bed_type: Optional[str] = None
+
+
+# ---------------------------
+# DOCTORS
+# ---------------------------
+class DoctorRegisterIn(BaseModel):
+    name: RequiredStr
+    mail: EmailStr
+    specialisation: Optional[str] = None
+    availability: Optional[str] = None
+    phone: Optional[str] = None
+
+
+class DoctorScheduleIn(BaseModel):
+    doctor_id: int
+    hospital_id: int
+    day_of_week: Optional[int] = Field(default=None, ge=0, le=6)  # 0=Mon .. 6=Sun
+    start_time: Optional[time] = None
+    end_time: Optional[time] = None
+    specific_date: Optional[date] = None
+    notes: Optional[str] = None
+
+
+# ---------------------------
+# EMERGENCY
+# ---------------------------
+class EmergencyCallIn(BaseModel):
+    emergency_type: RequiredStr
+    location: RequiredStr
+    contact_number: RequiredStr
+    details: Optional[str] = None
+    hospital_id: Optional[int] = None
+    user_id: Optional[int] = None
+
+
+# ---------------------------
+# BLOOD BANK
+# ---------------------------
+BloodType = Literal['A+', 'A-', 'B+', 'B-', 'AB+', 'AB-', 'O+', 'O-']
+
+
+class BloodBankRegisterIn(BaseModel):
+    name: RequiredStr
+    location: RequiredStr
+    contact_no: RequiredStr
+    email: EmailStr
+    blood_types_available: List[str] = []
+    stock_levels: Dict[str, int] = {}
+    category: Optional[str] = None
+
+
+class BloodStockIn(BaseModel):
+    blood_type: BloodType
+    units: int
+    expiry_date: Optional[date] = None
+    lot_number: Optional[str] = None
+
+
+class BloodRequestIn(BaseModel):
+    blood_group: RequiredStr
+    quantity_units: int = Field(gt=0)
+    location: RequiredStr
+    reference: RequiredStr
+    requester_name: str = 'none'
+    requester_phone: str = 'none'
+    requester_email: str = 'none'
+    bloodbank_id: Optional[int] = None
+    blood_inventory_id: Optional[int] = None
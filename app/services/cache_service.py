@@ -3,15 +3,20 @@ import json
 import pickle
 from datetime import datetime, timedelta
 from functools import wraps
-from flask import current_app
+from flask import current_app, request
+from flask_jwt_extended import get_jwt_identity
 import logging
 from typing import Any, Optional, Union, Dict
 import hashlib
+import orjson
 
 
 class CacheService:
     """Redis-based caching service for performance optimization"""
     
+    # Version keys outlive every versioned entry, so a lapsed version never revives old entries
+    VERSION_TTL = 86400
+    
     def __init__(self):
         self.redis_client = None
         self.logger = logging.getLogger(__name__)
@@ -60,9 +65,12 @@ class CacheService:
             cache_key = self._make_key(key)
             ttl = ttl or self.default_ttl
             
-            # Serialize value
+            # Serialize value; JSON is written as the app's JSON provider writes it, so a
+            # cached body served through get_fragment matches the freshly built one
             if isinstance(value, (dict, list)):
-                serialized_value = json.dumps(value, default=str)
+                serialized_value = json.dumps(
+                    value, default=str, sort_keys=True, separators=(',', ':'), ensure_ascii=False
+                )
             else:
                 serialized_value = pickle.dumps(value)
             
@@ -95,6 +103,26 @@ class CacheService:
             self.logger.error(f"Error getting cache key {key}: {str(e)}")
             return None
     
+    def get_fragment(self, key: str) -> Optional[orjson.Fragment]:
+        """
+        Get a cached dict or list as its stored JSON, wrapped in an orjson.Fragment
+        so a response embeds the bytes as-is instead of decoding and re-encoding them
+        """
+        if not self.is_available():
+            return None
+        
+        try:
+            value = self.redis_client.get(self._make_key(key))
+            
+            # set() stores dicts and lists as JSON; anything else was pickled
+            if value is None or value[:1] not in (b'{', b'['):
+                return None
+            return orjson.Fragment(value)
+            
+        except Exception as e:
+            self.logger.error(f"Error getting cache key {key}: {str(e)}")
+            return None
+    
     def delete(self, key: str) -> bool:
         """Delete a key from cache"""
         if not self.is_available():
@@ -109,6 +137,19 @@ class CacheService:
             self.logger.error(f"Error deleting cache key {key}: {str(e)}")
             return False
     
+    def delete_many(self, keys) -> bool:
+        """Delete several known keys in one round-trip"""
+        if not keys or not self.is_available():
+            return False
+        
+        try:
+            self.redis_client.delete(*[self._make_key(key) for key in keys])
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error deleting {len(keys)} cache keys: {str(e)}")
+            return False
+    
     def exists(self, key: str) -> bool:
         """Check if a key exists in cache"""
         if not self.is_available():
@@ -174,6 +215,135 @@ class CacheService:
             self.logger.error(f"Error incrementing cache key {key}: {str(e)}")
             return None
     
+    def get_version(self, namespace: str) -> int:
+        """
+        Current version of a key namespace; callers build their keys with it,
+        and bump_version retires them all without scanning the keyspace
+        """
+        return self.get(f"{namespace}:version") or 0
+    
+    def bump_version(self, namespace: str) -> bool:
+        """Move a namespace to a new version; entries under the old one lapse with their TTL"""
+        return self.bump_versions([f"{namespace}:version"], self.VERSION_TTL)
+    
+    def bump_versions(self, keys, ttl: int) -> bool:
+        """INCR each version key and refresh its TTL, in a single pipelined round-trip"""
+        if not keys or not self.is_available():
+            return False
+        
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in keys:
+                cache_key = self._make_key(key)
+                pipe.incr(cache_key)
+                pipe.expire(cache_key, ttl)
+            pipe.execute()
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error bumping {len(keys)} version keys: {str(e)}")
+            return False
+    
+    # INCRBY only when the key exists, so a counter that is not cached stays uncached.
+    # A missing counter instead gets its generation bumped, which voids any seed
+    # computed before this change (see seed_counter)
+    _ADJUST_COUNTER_SCRIPT = (
+        "if redis.call('EXISTS', KEYS[1]) == 1 then "
+        "return redis.call('INCRBY', KEYS[1], ARGV[1]) end "
+        "redis.call('INCR', KEYS[2]) "
+        "redis.call('EXPIRE', KEYS[2], ARGV[2]) "
+        "return nil"
+    )
+    
+    # SET NX, but only while the generation is still the one read before counting
+    _SEED_COUNTER_SCRIPT = (
+        "if redis.call('EXISTS', KEYS[1]) == 0 "
+        "and (redis.call('GET', KEYS[2]) or '0') == ARGV[2] then "
+        "redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3]) return 1 end "
+        "return 0"
+    )
+    
+    def _counter_keys(self, key: str):
+        """The prefixed counter key and the key holding its generation"""
+        cache_key = self._make_key(key)
+        return cache_key, f"{cache_key}:gen"
+    
+    def get_counter(self, key: str):
+        """
+        Read a counter and its generation in one round-trip: (value or None, generation).
+        Pass the generation to seed_counter when the value is missing.
+        """
+        if not self.is_available():
+            return None, 0
+        
+        try:
+            value, generation = self.redis_client.mget(self._counter_keys(key))
+            return (None if value is None else int(value)), int(generation or 0)
+            
+        except Exception as e:
+            self.logger.error(f"Error getting counter {key}: {str(e)}")
+            return None, 0
+    
+    def seed_counter(self, key: str, value: int, generation: int, ttl: Optional[int] = None) -> bool:
+        """
+        Store a freshly computed counter, unless one is already there or an
+        adjust_counter since get_counter returned `generation` would be lost
+        """
+        if not self.is_available():
+            return False
+        
+        try:
+            return bool(self.redis_client.eval(
+                self._SEED_COUNTER_SCRIPT, 2, *self._counter_keys(key),
+                int(value), generation, ttl or self.default_ttl
+            ))
+            
+        except Exception as e:
+            self.logger.error(f"Error seeding counter {key}: {str(e)}")
+            return False
+    
+    def set_counter(self, key: str, value: int, ttl: Optional[int] = None) -> bool:
+        """Store a plain integer that adjust_counter can change atomically"""
+        if not self.is_available():
+            return False
+        
+        try:
+            return bool(self.redis_client.set(self._make_key(key), int(value), ex=ttl or self.default_ttl))
+            
+        except Exception as e:
+            self.logger.error(f"Error setting counter {key}: {str(e)}")
+            return False
+    
+    def adjust_counter(self, key: str, amount: int) -> Optional[int]:
+        """Add `amount` to a counter stored by set_counter; a missing counter is left missing"""
+        if not self.is_available():
+            return None
+        
+        try:
+            return self.redis_client.eval(
+                self._ADJUST_COUNTER_SCRIPT, 2, *self._counter_keys(key), amount, self.VERSION_TTL
+            )
+            
+        except Exception as e:
+            self.logger.error(f"Error adjusting counter {key}: {str(e)}")
+            return None
+    
+    def adjust_counters(self, keys, amount: int) -> bool:
+        """adjust_counter for many counters in a single pipelined round-trip"""
+        if not keys or not self.is_available():
+            return False
+        
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in keys:
+                pipe.eval(self._ADJUST_COUNTER_SCRIPT, 2, *self._counter_keys(key), amount, self.VERSION_TTL)
+            pipe.execute()
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error adjusting {len(keys)} counters: {str(e)}")
+            return False
+    
     def set_hash(self, key: str, field: str, value: Any, ttl: Optional[int] = None) -> bool:
         """Set a field in a hash"""
         if not self.is_available():
@@ -393,6 +563,49 @@ def cache_invalidate(pattern: str):
     return decorator
 
 
+# Outlives any cached_response TTL, so a lapsed version never revives old entries
+RESPONSE_VERSION_TTL = 86400
+
+
+def _response_version_key(scope: str, user_id) -> str:
+    return f"resp:{scope}:{user_id}:version"
+
+
+def invalidate_cached_responses(scope: str, user_ids):
+    """
+    Retire the users' cached_response entries for `scope` by bumping their
+    version; the stale entries are never read again and lapse with their TTL
+    """
+    cache_service.bump_versions([_response_version_key(scope, user_id) for user_id in user_ids], RESPONSE_VERSION_TTL)
+
+
+def cached_response(scope: str, ttl: int):
+    """
+    Cache a per-user view's 200 response body for `ttl` seconds, keyed by `scope`,
+    the JWT identity, its version and the query string. Apply below @jwt_required().
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not cache_service.is_available():
+                return func(*args, **kwargs)
+            
+            user_id = get_jwt_identity()
+            version = cache_service.get(_response_version_key(scope, user_id)) or 0
+            cache_key = f"resp:{scope}:{user_id}:v{version}:{query_cache_key(request.args)}"
+            body = cache_service.get(cache_key)
+            if body is not None:
+                return current_app.response_class(body, mimetype='application/json')
+            
+            response = current_app.make_response(func(*args, **kwargs))
+            if response.status_code == 200:
+                cache_service.set(cache_key, response.get_data(), ttl)
+            return response
+        
+        return wrapper
+    return decorator
+
+
 # Hospital-specific cache patterns
 class HospitalCache:
     """Hospital-specific caching patterns"""
@@ -421,10 +634,173 @@ class HospitalCache:
         key = f"hospital:{hospital_id}:beds"
         return cache_service.set(key, bed_data, ttl)
     
+    @staticmethod
+    def get_hospital_details(hospital_id: int) -> Optional[orjson.Fragment]:
+        """Get a cached /hospital/<id> payload, as stored JSON"""
+        key = f"hospital:{hospital_id}:details"
+        return cache_service.get_fragment(key)
+    
+    @staticmethod
+    def set_hospital_details(hospital_id: int, data: Dict, ttl: int = 60) -> bool:
+        """Cache a /hospital/<id> payload (1 minute default)"""
+        key = f"hospital:{hospital_id}:details"
+        return cache_service.set(key, data, ttl)
+    
+    @staticmethod
+    def get_floors(hospital_id: int) -> Optional[orjson.Fragment]:
+        """Get a cached /hospital/<id>/floors payload, as stored JSON"""
+        key = f"hospital:{hospital_id}:floors"
+        return cache_service.get_fragment(key)
+    
+    @staticmethod
+    def set_floors(hospital_id: int, data: Dict, ttl: int = 60) -> bool:
+        """Cache a /hospital/<id>/floors payload (1 minute default)"""
+        key = f"hospital:{hospital_id}:floors"
+        return cache_service.set(key, data, ttl)
+    
+    @staticmethod
+    def get_list_version() -> int:
+        """Version of the /hospital/all payloads; read it once per request"""
+        return cache_service.get_version("hospitals:list")
+    
+    @staticmethod
+    def get_hospital_list(version: int, query_key: str) -> Optional[orjson.Fragment]:
+        """Get a cached /hospital/all payload, as stored JSON"""
+        key = f"hospitals:list:v{version}:{query_key}"
+        return cache_service.get_fragment(key)
+    
+    @staticmethod
+    def set_hospital_list(version: int, query_key: str, data: Dict, ttl: int = 30) -> bool:
+        """Cache a /hospital/all payload (30 seconds default)"""
+        key = f"hospitals:list:v{version}:{query_key}"
+        return cache_service.set(key, data, ttl)
+    
     @staticmethod
     def invalidate_hospital_data(hospital_id: int):
-        """Invalidate all cached data for a hospital"""
-        cache_service.flush_pattern(f"hospital:{hospital_id}:*")
+        """Invalidate all cached data for a hospital: its keys are known, so no scan"""
+        cache_service.delete_many([
+            f"hospital:{hospital_id}:{name}" for name in ('stats', 'beds', 'details', 'floors')
+        ])
+    
+    @staticmethod
+    def invalidate_hospital_lists():
+        """Invalidate every cached hospital listing"""
+        cache_service.bump_version("hospitals:list")
+
+
+# Listing cache patterns, keyed by the request's query string
+def query_cache_key(args) -> str:
+    """Stable digest of request args, independent of parameter order"""
+    key_data = str(sorted(args.items(multi=True)))
+    return hashlib.md5(key_data.encode()).hexdigest()
+
+
+class DoctorCache:
+    """Doctor roster caching patterns"""
+    
+    @staticmethod
+    def get_list_version() -> int:
+        """Version of the /doctor/all payloads; read it once per request"""
+        return cache_service.get_version("doctors:list")
+    
+    @staticmethod
+    def get_doctor_list(version: int, query_key: str) -> Optional[orjson.Fragment]:
+        """Get a cached /doctor/all payload, as stored JSON"""
+        key = f"doctors:list:v{version}:{query_key}"
+        return cache_service.get_fragment(key)
+    
+    @staticmethod
+    def set_doctor_list(version: int, query_key: str, data: Dict, ttl: int = 60) -> bool:
+        """Cache a /doctor/all payload (1 minute default)"""
+        key = f"doctors:list:v{version}:{query_key}"
+        return cache_service.set(key, data, ttl)
+    
+    @staticmethod
+    def get_roster_version() -> Optional[str]:
+        """Get the cached roster version behind the /doctor/all ETag"""
+        return cache_service.get("doctors:roster:version")
+    
+    @staticmethod
+    def set_roster_version(version: str, ttl: int = 60) -> bool:
+        """Cache the roster version (1 minute default)"""
+        return cache_service.set("doctors:roster:version", version, ttl)
+    
+    @staticmethod
+    def invalidate_doctor_lists():
+        """Invalidate every cached doctor listing and the roster version"""
+        cache_service.bump_version("doctors:list")
+        cache_service.delete("doctors:roster:version")
+
+
+class NotificationCache:
+    """Notification caching patterns"""
+    
+    # Unread counts are Redis counters adjusted as notifications are added, read and
+    # deleted; the TTL bounds any drift before the next COUNT reseeds them
+    UNREAD_COUNT_TTL = 3600
+    
+    @staticmethod
+    def get_unread_count(user_id):
+        """Get a user's cached unread count (or None) and the generation to seed it with"""
+        return cache_service.get_counter(f"unread_count:{user_id}")
+    
+    @staticmethod
+    def seed_unread_count(user_id, count: int, generation: int) -> bool:
+        """Cache a counted unread total, unless a counter is there or changed since get_unread_count"""
+        return cache_service.seed_counter(
+            f"unread_count:{user_id}", count, generation, NotificationCache.UNREAD_COUNT_TTL
+        )
+    
+    @staticmethod
+    def adjust_unread_count(user_id, amount: int):
+        """Add to (or subtract from) a cached unread count"""
+        cache_service.adjust_counter(f"unread_count:{user_id}", amount)
+    
+    @staticmethod
+    def adjust_unread_counts(user_ids, amount: int):
+        """adjust_unread_count for every user at once"""
+        cache_service.adjust_counters([f"unread_count:{user_id}" for user_id in user_ids], amount)
+    
+    @staticmethod
+    def reset_unread_count(user_id):
+        """Set a user's unread count to zero"""
+        cache_service.set_counter(f"unread_count:{user_id}", 0, NotificationCache.UNREAD_COUNT_TTL)
+    
+    @staticmethod
+    def invalidate_user_list(user_id):
+        """Retire a user's cached /notifications/my-notifications pages"""
+        invalidate_cached_responses('notifications', [user_id])
+    
+    @staticmethod
+    def invalidate_user_lists(user_ids):
+        """invalidate_user_list for every user at once"""
+        invalidate_cached_responses('notifications', user_ids)
+
+
+class AmbulanceCache:
+    """Ambulance fleet caching patterns"""
+    
+    @staticmethod
+    def get_version() -> int:
+        """Version of the available-ambulances payloads; read it once per request"""
+        return cache_service.get_version("ambulances:available")
+    
+    @staticmethod
+    def get_available(version: int, query_key: str) -> Optional[orjson.Fragment]:
+        """Get a cached available-ambulances payload, as stored JSON"""
+        key = f"ambulances:available:v{version}:{query_key}"
+        return cache_service.get_fragment(key)
+    
+    @staticmethod
+    def set_available(version: int, query_key: str, data: Dict, ttl: int = 60) -> bool:
+        """Cache an available-ambulances payload (1 minute default)"""
+        key = f"ambulances:available:v{version}:{query_key}"
+        return cache_service.set(key, data, ttl)
+    
+    @staticmethod
+    def invalidate_available():
+        """Invalidate every cached available-ambulances payload"""
+        cache_service.bump_version("ambulances:available")
 
 
 # Appointment-specific cache patterns
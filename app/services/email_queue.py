@@ -0,0 +1,101 @@
+"""
+Redis Stream outbox for notification emails.
+
+With EMAIL_QUEUE_ENABLED set and Redis reachable, /notifications/send and
+/notifications/broadcast append one entry per request (all its recipients)
+to a stream and answer without waiting on SMTP. A worker process sends them:
+
+    python -m app.services.email_queue
+
+Without the queue the emails are sent inline, as before.
+"""
+import logging
+import socket
+
+import orjson
+import redis
+from flask import current_app
+
+from app.services.cache_service import cache_service
+from app.services.email_service import email_service
+
+STREAM = 'email:outbox'
+GROUP = 'email-senders'
+
+
+class EmailOutbox:
+    """Queue notification emails in a Redis Stream and send them from a worker"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def _stream_key(self) -> str:
+        return f"{cache_service.key_prefix}{STREAM}"
+
+    def enqueue(self, recipients, subject: str, body: str):
+        """Queue one email per (email, name) recipient; returns the entry id, or None to send inline"""
+        if not current_app.config.get('EMAIL_QUEUE_ENABLED') or not cache_service.is_available():
+            return None
+
+        try:
+            payload = orjson.dumps({'recipients': recipients, 'subject': subject, 'body': body})
+            entry_id = cache_service.redis_client.xadd(self._stream_key(), {'payload': payload})
+            return entry_id.decode('ascii')
+
+        except Exception as e:
+            self.logger.error(f"Error queueing notification emails, sending inline: {str(e)}")
+            return None
+
+    def send(self, recipients, subject: str, body: str):
+        """Send the emails now, logging the ones SMTP rejects"""
+        for email, name in recipients:
+            success, message = email_service.send_email(email, subject, body)
+            if not success:
+                self.logger.error(f"Notification email to {email} failed: {message}")
+
+    def run_worker(self, app, consumer: str = None, block_ms: int = 5000, count: int = 10):
+        """Send queued emails until interrupted"""
+        redis_client = cache_service.redis_client
+        if redis_client is None:
+            raise RuntimeError('Redis is not available; the email outbox worker needs it')
+
+        stream = self._stream_key()
+        # A stable name lets a restarted worker pick up the entries it had not acknowledged
+        consumer = consumer or socket.gethostname()
+
+        try:
+            redis_client.xgroup_create(stream, GROUP, id='0', mkstream=True)
+        except redis.ResponseError:
+            pass  # BUSYGROUP: the group already exists
+
+        # '0' replays this consumer's unacknowledged entries; '>' then reads new ones
+        last_id = '0'
+        while True:
+            batches = redis_client.xreadgroup(GROUP, consumer, {stream: last_id}, count=count, block=block_ms)
+            entries = batches[0][1] if batches else []
+            if not entries:
+                last_id = '>'
+                continue
+
+            with app.app_context():
+                for entry_id, fields in entries:
+                    try:
+                        job = orjson.loads(fields[b'payload'])
+                        self.send(job['recipients'], job['subject'], job['body'])
+                    except Exception as e:
+                        # A resend could duplicate the emails that did go out; log and move on
+                        self.logger.error(f"Dropping email job {entry_id} {fields!r}: {str(e)}")
+
+                    redis_client.xack(stream, GROUP, entry_id)
+
+
+# Global email outbox instance
+email_outbox = EmailOutbox()
+
+
+if __name__ == '__main__':
+    from app import create_app
+
+    app = create_app()
+    logging.getLogger(__name__).info("Email outbox worker started")
+    email_outbox.run_worker(app)
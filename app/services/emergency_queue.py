@@ -0,0 +1,122 @@
+"""
+Redis Stream inbox for /emergency/call.
+
+With EMERGENCY_INBOX_ENABLED set and Redis reachable, the route appends the
+call to a stream and answers 202 without waiting for the database. A worker
+process drains the stream into the emergency table:
+
+    python -m app.services.emergency_queue
+
+Run Redis with AOF persistence so queued calls survive a Redis restart.
+"""
+import logging
+import socket
+import time
+from datetime import datetime
+
+import orjson
+import redis
+from flask import current_app
+from sqlalchemy.exc import OperationalError
+
+from app.models import db, Emergency
+from app.services.cache_service import cache_service
+
+STREAM = 'emergency:inbox'
+GROUP = 'emergency-writers'
+# Calls the database rejected, kept for an operator to fix and replay
+DEAD_LETTER_STREAM = 'emergency:dead'
+
+
+class EmergencyInbox:
+    """Queue emergency calls in a Redis Stream and write them to the database in a worker"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def _stream_key(self) -> str:
+        return f"{cache_service.key_prefix}{STREAM}"
+
+    def enqueue(self, fields: dict):
+        """Append a call to the stream; returns the entry id, or None to insert directly"""
+        if not current_app.config.get('EMERGENCY_INBOX_ENABLED') or not cache_service.is_available():
+            return None
+
+        try:
+            entry_id = cache_service.redis_client.xadd(self._stream_key(), {'payload': orjson.dumps(fields)})
+            return entry_id.decode('ascii')
+
+        except Exception as e:
+            self.logger.error(f"Error queueing emergency call, inserting directly: {str(e)}")
+            return None
+
+    def _store(self, payload: bytes):
+        """Insert one queued call"""
+        data = orjson.loads(payload)
+        data['created_at'] = datetime.fromisoformat(data['created_at'])
+        db.session.add(Emergency(**data))
+        db.session.commit()
+
+    def run_worker(self, app, consumer: str = None, block_ms: int = 5000, count: int = 50):
+        """Drain the stream into the database until interrupted"""
+        redis_client = cache_service.redis_client
+        if redis_client is None:
+            raise RuntimeError('Redis is not available; the emergency inbox worker needs it')
+
+        stream = self._stream_key()
+        # A stable name lets a restarted worker pick up the entries it had not acknowledged
+        consumer = consumer or socket.gethostname()
+
+        try:
+            redis_client.xgroup_create(stream, GROUP, id='0', mkstream=True)
+        except redis.ResponseError:
+            pass  # BUSYGROUP: the group already exists
+
+        # '0' replays this consumer's unacknowledged entries; '>' then reads new ones
+        last_id = '0'
+        while True:
+            batches = redis_client.xreadgroup(GROUP, consumer, {stream: last_id}, count=count, block=block_ms)
+            entries = batches[0][1] if batches else []
+            if not entries:
+                last_id = '>'
+                continue
+
+            with app.app_context():
+                for entry_id, fields in entries:
+                    try:
+                        self._store(fields[b'payload'])
+                    except OperationalError as e:
+                        # Database unreachable: keep the entry pending and retry it shortly
+                        db.session.rollback()
+                        self.logger.error(f"Database unavailable, retrying emergency {entry_id}: {str(e)}")
+                        time.sleep(5)
+                        last_id = '0'
+                        break
+                    except Exception as e:
+                        # Retrying cannot fix a rejected row: park it in the dead-letter stream
+                        # rather than block the stream; the caller already has a 202
+                        db.session.rollback()
+                        try:
+                            redis_client.xadd(
+                                f"{cache_service.key_prefix}{DEAD_LETTER_STREAM}",
+                                {'payload': fields[b'payload'], 'entry_id': entry_id, 'error': str(e)}
+                            )
+                        except redis.RedisError as dead_letter_error:
+                            # Not parked, so not acked: it stays pending and replays on restart
+                            self.logger.error(f"Could not dead-letter emergency {entry_id}: {str(dead_letter_error)}")
+                            continue
+                        self.logger.error(f"Moved emergency {entry_id} to {DEAD_LETTER_STREAM}: {str(e)}")
+
+                    redis_client.xack(stream, GROUP, entry_id)
+
+
+# Global emergency inbox instance
+emergency_inbox = EmergencyInbox()
+
+
+if __name__ == '__main__':
+    from app import create_app
+
+    app = create_app()
+    logging.getLogger(__name__).info("Emergency inbox worker started")
+    emergency_inbox.run_worker(app)
@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta
 from sqlalchemy import func, text, desc, asc, and_, or_
 from flask import current_app
+from sqlalchemy.orm import selectinload
 import json
 import csv
 import io
@@ -40,7 +41,10 @@ class ReportingService:
                 query_filter.append(Hospital.id == hospital_id)
             
             # Basic hospital metrics
-            hospitals_query = Hospital.query
+            # The bed counts are summed from the ward counters; load floors and wards in one IN query each
+            hospitals_query = Hospital.query.options(
+                selectinload(Hospital.floors).selectinload(Floor.wards)
+            )
             if hospital_id:
                 hospitals_query = hospitals_query.filter(Hospital.id == hospital_id)
             
@@ -63,8 +67,8 @@ class ReportingService:
                     'type': hospital.hospital_type,
                     'bed_availability': hospital.bedAvailability,
                     'opd_status': hospital.opd_status.value if hospital.opd_status else None,
-                    'total_floors': hospital.floors.count(),
-                    'total_wards': sum(floor.wards.count() for floor in hospital.floors),
+                    'total_floors': len(hospital.floors),
+                    'total_wards': sum(len(floor.wards) for floor in hospital.floors),
                     'total_beds': self._count_hospital_beds(hospital),
                     'bed_occupancy': self._calculate_bed_occupancy(hospital),
                     'appointments': self._get_appointment_stats(hospital.id, start_date, end_date),
@@ -89,7 +93,7 @@ class ReportingService:
         total_beds = 0
         for floor in hospital.floors:
             for ward in floor.wards:
-                total_beds += ward.beds.count()
+                total_beds += ward.bed_count
         return total_beds
     
     def _calculate_bed_occupancy(self, hospital):
@@ -101,7 +105,7 @@ class ReportingService:
         occupied_beds = 0
         for floor in hospital.floors:
             for ward in floor.wards:
-                occupied_beds += ward.beds.filter(Bed.status == BedStatus.OCCUPIED).count()
+                occupied_beds += ward.occupied_beds
         
         return round((occupied_beds / total_beds) * 100, 2)
     
@@ -661,15 +665,18 @@ class ReportingService:
     
     def _get_bed_occupancy_data(self, hospital_id):
         """Get bed occupancy data for charts"""
-        hospital = Hospital.query.get(hospital_id)
+        hospital = db.session.get(
+            Hospital, hospital_id,
+            options=[selectinload(Hospital.floors).selectinload(Floor.wards).selectinload(Ward.category)]
+        )
         if not hospital:
             return None
         
         ward_data = []
         for floor in hospital.floors:
             for ward in floor.wards:
-                total_beds = ward.beds.count()
-                occupied_beds = ward.beds.filter(Bed.status == BedStatus.OCCUPIED).count()
+                total_beds = ward.bed_count
+                occupied_beds = ward.occupied_beds
                 occupancy = (occupied_beds / total_beds * 100) if total_beds > 0 else 0
                 
                 ward_data.append({
@@ -218,6 +218,14 @@ class WebSocketService:
         self.socketio.emit(event, data, room=room)
         self.logger.debug(f"Emitted {event} to user {user_id}")
     
+    def emit_to_users(self, user_ids, event, data):
+        """Emit the same event to several users in one call; the packet is encoded once"""
+        rooms = [f"user_{user_id}" for user_id in user_ids]
+        if not rooms:
+            return
+        self.socketio.emit(event, data, to=rooms)
+        self.logger.debug(f"Emitted {event} to {len(rooms)} users")
+    
     def emit_to_role(self, role, event, data):
         """Emit event to all users with a specific role"""
         room = f"role_{role}"
@@ -0,0 +1,296 @@
+let currentToken = '';
+
+// Per-card elements, captured once after the cards are rendered
+let cardRefs = [];
+
+// Position of each tab (and its content panel) within a card
+const TAB_INDEX = { test: 0, example: 1, response: 2 };
+
+// Initialize the interface
+function initializeInterface() {
+    collectCardRefs();
+}
+
+// The endpoint cards are rendered on the server; capture what the handlers need from each
+function collectCardRefs() {
+    const container = document.getElementById('endpointsContainer');
+
+    cardRefs = Array.from(container.children, card => ({
+        endpoint: {
+            method: card.dataset.method,
+            path: card.dataset.path,
+            requiresAuth: card.dataset.requiresAuth === 'true'
+        },
+        tabs: Array.from(card.querySelectorAll('.tab')),
+        contents: Array.from(card.querySelectorAll('.tab-content')),
+        responseArea: card.querySelector('.response-area'),
+        pathInputs: inputsByParam(card, 'path'),
+        queryInputs: inputsByParam(card, 'query'),
+        bodyInput: card.querySelector('[data-role="body"]')
+    }));
+}
+
+function inputsByParam(card, role) {
+    const inputs = {};
+    card.querySelectorAll(`[data-role="${role}"]`).forEach(input => {
+        inputs[input.dataset.param] = input;
+    });
+    return inputs;
+}
+
+// Switch tabs
+function switchTab(endpointIndex, tabName) {
+    const { tabs, contents } = cardRefs[endpointIndex];
+    const selected = TAB_INDEX[tabName];
+
+    tabs.forEach((tab, i) => tab.classList.toggle('active', i === selected));
+    contents.forEach((content, i) => content.classList.toggle('active', i === selected));
+
+    const content = contents[selected];
+    if (tabName === 'example' && !content.dataset.highlighted) {
+        content.dataset.highlighted = 'true';
+        withPrism(() => Prism.highlightAllUnder(content));
+    }
+}
+
+// Prism is fetched the first time something needs highlighting, not on page load
+let prismLoading = null;
+
+function loadPrism() {
+    if (!prismLoading) {
+        window.Prism = { manual: true };
+        const sources = document.body.dataset.prismScripts.split(' ');
+
+        // async = false: download in parallel but execute in order (core before languages)
+        prismLoading = Promise.all(sources.map(src => new Promise((resolve, reject) => {
+            const script = document.createElement('script');
+            script.src = src;
+            script.async = false;
+            script.onload = resolve;
+            script.onerror = reject;
+            document.head.append(script);
+        })));
+    }
+    return prismLoading;
+}
+
+function withPrism(highlight) {
+    // Highlighting is cosmetic: if the CDN is unreachable the plain text stays
+    loadPrism().then(highlight).catch(() => {});
+}
+
+// Authentication
+function authenticate() {
+    const email = document.getElementById('loginEmail').value;
+    const password = document.getElementById('loginPassword').value;
+    const type = document.getElementById('loginType').value;
+
+    let endpoint = '/auth/login';
+    let body = { email, password };
+
+    if (type === 'admin') {
+        endpoint = '/auth/admin/login';
+        body = { username: email, password };
+    } else if (type === 'hospital') {
+        endpoint = '/auth/hospital/login';
+        body = { username: email, password };
+    }
+
+    makeRequest('POST', endpoint, body)
+        .then(response => {
+            if (response.success && response.data.access_token) {
+                currentToken = response.data.access_token;
+                const tokenDisplay = document.getElementById('tokenDisplay');
+                tokenDisplay.innerHTML = `
+                    <strong>Access Token:</strong><br>
+                    <code>${currentToken}</code><br>
+                    <small style="color: #28a745;">✓ Token saved automatically for protected endpoints</small>
+                `;
+                tokenDisplay.style.display = 'block';
+            }
+        })
+        .catch(error => {
+            console.error('Authentication failed:', error);
+            alert('Authentication failed. Please check your credentials.');
+        });
+}
+
+// Test endpoint
+function testEndpoint(index) {
+    const refs = cardRefs[index];
+    const endpoint = refs.endpoint;
+
+    // Handle path parameters in a single pass; unfilled ones stay as {param}
+    let url = endpoint.path.replace(/{(\w+)}/g, (match, param) => {
+        const input = refs.pathInputs[param];
+        return input && input.value ? input.value : match;
+    });
+
+    // Handle query parameters
+    const queryParams = [];
+    for (const [param, input] of Object.entries(refs.queryInputs)) {
+        if (input.value) {
+            queryParams.push(`${param}=${encodeURIComponent(input.value)}`);
+        }
+    }
+
+    if (queryParams.length > 0) {
+        url += '?' + queryParams.join('&');
+    }
+
+    // Handle request body
+    let body = null;
+    const bodyInput = refs.bodyInput;
+    if (bodyInput && bodyInput.value.trim()) {
+        try {
+            body = JSON.parse(bodyInput.value);
+        } catch (e) {
+            alert('Invalid JSON in request body');
+            return;
+        }
+    }
+
+    makeRequest(endpoint.method, url, body, endpoint.requiresAuth)
+        .then(response => {
+            displayResponse(index, response, 200);
+        })
+        .catch(error => {
+            displayResponse(index, error, error.status || 500);
+        });
+}
+
+// Make HTTP request
+function makeRequest(method, url, body = null, requiresAuth = false) {
+    const headers = {
+        'Content-Type': 'application/json'
+    };
+
+    if (requiresAuth && currentToken) {
+        headers.Authorization = `Bearer ${currentToken}`;
+    }
+
+    const config = {
+        method,
+        headers
+    };
+
+    if (body && method !== 'GET') {
+        config.body = JSON.stringify(body);
+    }
+
+    return fetch(url, config)
+        .then(response => {
+            if (!response.ok) {
+                return response.json().then(err => {
+                    err.status = response.status;
+                    throw err;
+                });
+            }
+            return response.json();
+        });
+}
+
+// Display response
+function displayResponse(index, data, status) {
+    const responseDiv = cardRefs[index].responseArea;
+    const statusClass = status >= 200 && status < 300 ? 'status-200' : status >= 400 && status < 500 ? 'status-400' : 'status-500';
+
+    // Built with textContent: response strings are shown as text, never parsed as HTML
+    const statusLine = document.createElement('div');
+    statusLine.style.marginBottom = '10px';
+    const indicator = document.createElement('span');
+    indicator.className = `status-indicator ${statusClass}`;
+    const label = document.createElement('strong');
+    label.textContent = `Status: ${status}`;
+    statusLine.append(indicator, label);
+
+    const code = document.createElement('code');
+    code.className = 'language-json';
+    code.textContent = 'Formatting response...';
+    const pre = document.createElement('pre');
+    pre.append(code);
+
+    responseDiv.replaceChildren(statusLine, pre);
+    switchTab(index, 'response');
+
+    formatJSON(data).then(text => {
+        code.textContent = text;
+        withPrism(() => Prism.highlightElement(code));
+    });
+}
+
+// Pretty-print in a worker so large responses do not block the page
+let jsonWorker = null;
+let jsonJobId = 0;
+const jsonJobs = new Map();
+
+function formatJSON(data) {
+    if (!window.Worker) {
+        return Promise.resolve(JSON.stringify(data, null, 2));
+    }
+
+    if (!jsonWorker) {
+        jsonWorker = new Worker(document.body.dataset.jsonWorker);
+        jsonWorker.onmessage = (event) => {
+            const { id, text } = event.data;
+            jsonJobs.get(id)(text);
+            jsonJobs.delete(id);
+        };
+    }
+
+    const id = ++jsonJobId;
+    return new Promise(resolve => {
+        jsonJobs.set(id, resolve);
+        jsonWorker.postMessage({ id, payload: data });
+    });
+}
+
+// Quick action functions
+function testHealthCheck() {
+    makeRequest('GET', '/health')
+        .then(response => alert(`Health Check: ${response.message}\nStatus: ${response.data.status}`))
+        .catch(error => alert('Health check failed'));
+}
+
+function getSystemStats() {
+    makeRequest('GET', '/admin/dashboard/stats', null, true)
+        .then(response => alert(`System Stats:\n${JSON.stringify(response.data, null, 2)}`))
+        .catch(error => alert('Failed to get system stats. Make sure you are authenticated as admin.'));
+}
+
+function listHospitals() {
+    makeRequest('GET', '/hospital/all')
+        .then(response => {
+            const hospitals = response.data;
+            alert(`Found ${hospitals.length} hospitals:\n${hospitals.map(h => `• ${h.name} - ${h.location}`).join('\n')}`);
+        })
+        .catch(error => alert('Failed to get hospitals list'));
+}
+
+function getMyProfile() {
+    makeRequest('GET', '/auth/profile', null, true)
+        .then(response => alert(`Your Profile:\n${JSON.stringify(response.data, null, 2)}`))
+        .catch(error => alert('Failed to get profile. Make sure you are authenticated.'));
+}
+
+// Click handlers, keyed by the data-action attribute of the clicked element
+const actions = {
+    authenticate,
+    testHealthCheck,
+    getSystemStats,
+    listHospitals,
+    getMyProfile,
+    switchTab: (el) => switchTab(Number(el.dataset.index), el.dataset.tab),
+    testEndpoint: (el) => testEndpoint(Number(el.dataset.index))
+};
+
+// A single delegated listener serves every button on the page
+document.addEventListener('click', (event) => {
+    const el = event.target.closest('[data-action]');
+    if (el && actions[el.dataset.action]) {
+        actions[el.dataset.action](el);
+    }
+});
+
+// Initialize on page load
+document.addEventListener('DOMContentLoaded', initializeInterface);
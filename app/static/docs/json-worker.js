@@ -0,0 +1,5 @@
+// Pretty-prints API responses off the main thread for the docs page
+self.onmessage = (event) => {
+    const { id, payload } = event.data;
+    self.postMessage({ id, text: JSON.stringify(payload, null, 2) });
+};
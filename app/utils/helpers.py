@@ -1,16 +1,23 @@
+import base64
 import bcrypt
+import enum
+import hashlib
 import re
 import secrets
 import string
-from datetime import datetime
-from flask import current_app
+from datetime import date, datetime, time
+from functools import wraps
+from flask import Response, current_app, g, request
 import os
+import orjson
+from sqlalchemy import tuple_
 from werkzeug.utils import secure_filename
+from app import ORJSONProvider
 
 
 def hash_password(password):
-    """Hash a password using bcrypt"""
-    salt = bcrypt.gensalt()
+    """Hash a password using bcrypt at the configured BCRYPT_ROUNDS"""
+    salt = bcrypt.gensalt(rounds=current_app.config.get('BCRYPT_ROUNDS', 12) if current_app else 12)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
@@ -115,6 +122,18 @@ def format_time(time):
     return None
 
 
+def read_replica(f):
+    """Run a read-only handler's queries on the 'replica' bind when one is configured"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        g.db_read_only = True
+        try:
+            return f(*args, **kwargs)
+        finally:
+            g.pop('db_read_only', None)
+    return decorated
+
+
 def paginate_query(query, page, per_page, error_out=False):
     """Paginate a SQLAlchemy query"""
     return query.paginate(
@@ -124,31 +143,160 @@ def paginate_query(query, page, per_page, error_out=False):
     )
 
 
-def serialize_model(model, fields=None, exclude=None):
-    """Serialize a SQLAlchemy model to dictionary"""
-    data = {}
+def encode_cursor(values):
+    """Encode the ordering values of the last row on a page as an opaque cursor"""
+    return base64.urlsafe_b64encode(orjson.dumps(values)).decode('ascii')
+
+
+def decode_cursor(cursor, columns):
+    """Decode a cursor back into values for `columns`; raises ValueError if malformed"""
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, TypeError) as e:
+        raise ValueError('Invalid cursor') from e
+    
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError('Invalid cursor')
     
-    for column in model.__table__.columns:
+    decoded = []
+    for column, value in zip(columns, values):
+        if value is not None and column.type.python_type is datetime:
+            value = datetime.fromisoformat(value)
+        decoded.append(value)
+    return decoded
+
+
+def keyset_paginate(query, columns, cursor, per_page, descending=False):
+    """
+    Fetch the page of `query` that follows `cursor`, ordered by `columns`
+    (the last column must be unique, e.g. the primary key).
+    
+    Seeks past the previous page with a row comparison instead of OFFSET and
+    never runs COUNT(*). Returns (rows, next_cursor); next_cursor is None on
+    the last page.
+    """
+    if cursor:
+        key, after = tuple_(*columns), tuple_(*decode_cursor(cursor, columns))
+        query = query.filter(key < after if descending else key > after)
+    
+    per_page = max(per_page, 1)
+    order = [column.desc() for column in columns] if descending else columns
+    rows = query.order_by(*order).limit(per_page + 1).all()
+    
+    if len(rows) <= per_page:
+        return rows, None
+    
+    rows = rows[:per_page]
+    return rows, encode_cursor([getattr(rows[-1], column.key) for column in columns])
+
+
+MAX_PER_PAGE = 100
+
+
+def parse_per_page(args, default=20, maximum=MAX_PER_PAGE):
+    """The per_page query argument; raises ValueError unless it is an integer from 1 to `maximum`"""
+    per_page = int(args.get('per_page', default))
+    if not 1 <= per_page <= maximum:
+        raise ValueError(f'per_page must be between 1 and {maximum}')
+    return per_page
+
+
+# Generated serializers keyed by (model class, fields, exclude)
+_SERIALIZERS = {}
+
+
+def _enum_value(value):
+    """Return the raw value of an Enum member, passing anything else through"""
+    return getattr(value, 'value', value)
+
+
+def _column_converter(column):
+    """Pick the formatter for a column based on its declared Python type"""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return None
+
+    if issubclass(python_type, datetime):
+        return format_datetime
+    if issubclass(python_type, date):
+        return format_date
+    if issubclass(python_type, time):
+        return format_time
+    if issubclass(python_type, enum.Enum):
+        return _enum_value
+    return None
+
+
+def _build_serializer(model_class, fields, exclude):
+    """Compile a function returning a single dict literal for the model's columns"""
+    namespace = {}
+    entries = []
+
+    for index, column in enumerate(model_class.__table__.columns):
         if exclude and column.name in exclude:
             continue
         if fields and column.name not in fields:
             continue
-            
-        value = getattr(model, column.name)
-        
-        # Handle different data types
-        if isinstance(value, datetime):
-            data[column.name] = format_datetime(value)
-        elif hasattr(value, 'date') and callable(getattr(value, 'date')):
-            data[column.name] = format_date(value)
-        elif hasattr(value, 'strftime') and not isinstance(value, datetime):  # Time objects
-            data[column.name] = format_time(value)
-        elif hasattr(value, 'value'):  # Enum values
-            data[column.name] = value.value
-        else:
-            data[column.name] = value
-    
-    return data
+
+        accessor = f'o.{column.name}' if column.name.isidentifier() else f'getattr(o, {column.name!r})'
+        converter = _column_converter(column)
+        if converter is not None:
+            namespace[f'_convert_{index}'] = converter
+            accessor = f'_convert_{index}({accessor})'
+
+        entries.append(f'{column.name!r}: {accessor}')
+
+    source = f"def _serialize(o):\n    return {{{', '.join(entries)}}}\n"
+    exec(compile(source, f'<serializer {model_class.__name__}>', 'exec'), namespace)
+    return namespace['_serialize']
+
+
+def _get_serializer(model_class, fields, exclude):
+    """Return the memoized serializer for a model class and field selection"""
+    key = (
+        model_class,
+        frozenset(fields) if fields else None,
+        frozenset(exclude) if exclude else None
+    )
+
+    serializer = _SERIALIZERS.get(key)
+    if serializer is None:
+        serializer = _SERIALIZERS[key] = _build_serializer(model_class, key[1], key[2])
+
+    return serializer
+
+
+def serialize_model(model, fields=None, exclude=None):
+    """Serialize a SQLAlchemy model to dictionary"""
+    return _get_serializer(type(model), fields, exclude)(model)
+
+
+def serialize_row(model_class, row, fields=None, exclude=None):
+    """Serialize a Core result row selected from model_class's table columns"""
+    return _get_serializer(model_class, fields, exclude)(row)
+
+
+def model_serializer(model_class, fields=None, exclude=None):
+    """Return the compiled serializer, for loops that serialize many rows of one model"""
+    return _get_serializer(model_class, fields, exclude)
+
+
+def serialize_many(model_class, models, fields=None, exclude=None):
+    """Serialize a list of model_class instances, looking the serializer up once"""
+    return list(map(_get_serializer(model_class, fields, exclude), models))
+
+
+def prefixed_columns(model_class, fields, prefix):
+    """Columns labelled '<prefix>__<field>' so they sit alongside another table's columns"""
+    return [getattr(model_class, field).label(f'{prefix}__{field}') for field in fields]
+
+
+def joined_fields(mapping, fields, prefix):
+    """Rebuild a dict from prefixed columns; None when the outer join found no row"""
+    if mapping[f'{prefix}__id'] is None:
+        return None
+    return {field: mapping[f'{prefix}__{field}'] for field in fields}
 
 
 def validate_required_fields(data, required_fields):
@@ -231,6 +379,34 @@ def create_success_response(message, data=None, status_code=200):
     return response, status_code
 
 
+def prebuilt_success_response(message, data=None):
+    """
+    Serialize a constant success response once, for module-level use.
+    Uses the app JSON provider's options, so the body matches its compact
+    (non-debug) response. Returns (body, etag) to pass to send_cacheable.
+    """
+    payload, _ = create_success_response(message, data)
+    body = orjson.dumps(payload, option=ORJSONProvider.option | orjson.OPT_APPEND_NEWLINE)
+    return body, hashlib.sha1(body).hexdigest()
+
+
+def send_cacheable(body, etag, mimetype, max_age, public=True):
+    """
+    Send a constant body with a strong content-hash ETag.
+    Revalidations whose If-None-Match matches get an empty 304.
+    """
+    # Bodies are prebuilt bytes: hand them to the server as-is, length known up front
+    response = Response(body, mimetype=mimetype, direct_passthrough=True)
+    response.content_length = len(body)
+    if public:
+        response.cache_control.public = True
+    else:
+        response.cache_control.private = True
+    response.cache_control.max_age = max_age
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+
 def create_error_response(message, errors=None, status_code=400):
     """Create a standardized error response"""
     response = {
@@ -6,6 +6,18 @@ basedir = os.path.abspath(os.path.dirname(__file__))
 load_dotenv(os.path.join(basedir, '.env'))
 
 
+# Largest default pool for a gevent worker; greenlets beyond it wait for a connection
+GEVENT_DB_POOL_CAP = 20
+
+
+def _default_db_pool_size():
+    """Connections a worker can use at once, per gunicorn.conf.py's worker settings"""
+    if os.environ.get('GUNICORN_WORKER_CLASS') == 'gevent':
+        return min(int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000)), GEVENT_DB_POOL_CAP)
+    # One per gunicorn thread, plus one for each of the 4 admin dashboard query threads
+    return int(os.environ.get('GUNICORN_THREADS', 4)) + 4
+
+
 class Config:
     """Base configuration class."""
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
@@ -14,8 +26,13 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         'sqlite:///' + os.path.join(basedir, 'hospital_management.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Optional read replica for GET handlers marked @read_replica
+    SQLALCHEMY_BINDS = {'replica': os.environ['DATABASE_REPLICA_URL']} if os.environ.get('DATABASE_REPLICA_URL') else {}
     SQLALCHEMY_RECORD_QUERIES = True
     
+    # bcrypt work factor: each +1 doubles the cost of hashing and checking a password
+    BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))
+    
     # JWT Configuration
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-string'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=int(os.environ.get('JWT_ACCESS_TOKEN_EXPIRES', 1)))
@@ -45,6 +62,12 @@ class Config:
     ADMIN_EMAIL = os.environ.get('ADMIN_EMAIL') or 'admin@hospital.com'
     ADMIN_PASSWORD = os.environ.get('ADMIN_PASSWORD') or 'admin123'
     
+    # Queue /emergency/call in a Redis Stream (needs the emergency inbox worker running)
+    EMERGENCY_INBOX_ENABLED = os.environ.get('EMERGENCY_INBOX_ENABLED', 'false').lower() in ['true', 'on', '1']
+    
+    # Queue notification emails in a Redis Stream (needs the email outbox worker running)
+    EMAIL_QUEUE_ENABLED = os.environ.get('EMAIL_QUEUE_ENABLED', 'false').lower() in ['true', 'on', '1']
+    
     # Cache Configuration
     CACHE_DEFAULT_TTL = int(os.environ.get('CACHE_DEFAULT_TTL', 3600))
     CACHE_KEY_PREFIX = os.environ.get('CACHE_KEY_PREFIX', 'hospital_mgmt:')
@@ -73,12 +96,22 @@ class ProductionConfig(Config):
     # Override with more secure settings
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         'sqlite:///' + os.path.join(basedir, 'hospital_management.db')
+    
+    # Pool sized to the worker's concurrency. Pre-ping costs a SELECT 1 per
+    # checkout; leave it off behind pgbouncer, which replaces dead server connections
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', _default_db_pool_size())),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 0)),
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'false').lower() in ['true', 'on', '1'],
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    }
 
 
 class TestingConfig(Config):
     """Testing configuration."""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    BCRYPT_ROUNDS = 4  # bcrypt's minimum; keeps fixtures fast
     WTF_CSRF_ENABLED = False
     JWT_COOKIE_CSRF_PROTECT = False
 
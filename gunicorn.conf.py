@@ -0,0 +1,57 @@
+# gunicorn.conf.py
+"""
+Gunicorn settings for production deployments:
+
+    gunicorn -c gunicorn.conf.py run:app
+
+Workers default to one per CPU with a small thread pool each, so slow
+requests (database, email, report generation) do not block the whole
+worker. Override with WEB_CONCURRENCY and GUNICORN_THREADS.
+
+GUNICORN_WORKER_CLASS=gevent switches to gevent workers (gevent and
+psycogreen, listed as optional in requirements.txt): each worker interleaves
+up to GUNICORN_WORKER_CONNECTIONS requests while they wait on the database,
+Redis or SMTP. Gunicorn monkey-patches the worker before it imports the app.
+The database pool stays small (at most 20 by default, see config.py), so
+greenlets share connections; see docs/DEPLOYMENT_INSTRUCTIONS.md.
+
+Socket.IO note: gthread workers serve Socket.IO over long-polling only.
+Running more than one worker also needs sticky sessions at the proxy and a
+Socket.IO message queue; set WEB_CONCURRENCY=1 until both are in place.
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+timeout = 60
+keepalive = 5
+
+# Recycle workers periodically to cap memory growth from long-lived processes
+max_requests = 2000
+max_requests_jitter = 200
+
+accesslog = '-'
+errorlog = '-'
+
+
+def on_starting(server):
+    """Build the docs page once in the master instead of racing in every worker"""
+    from app import build_docs
+    build_docs.ensure_built()
+
+
+def post_fork(server, worker):
+    """Under gevent, make psycopg2 yield to other greenlets while it waits on PostgreSQL"""
+    if worker_class != 'gevent':
+        return
+    try:
+        from psycogreen.gevent import patch_psycopg
+    except ImportError:
+        server.log.warning("psycogreen is not installed; database calls will block the gevent worker")
+        return
+    patch_psycopg()
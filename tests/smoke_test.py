@@ -4,9 +4,12 @@ Tests all available routes to ensure basic functionality
 """
 
 import pytest
+import gzip
 import json
+import re
 import sys
 import os
+from datetime import datetime, timedelta
 from unittest.mock import patch
 
 # Add the project root directory to the path so we can import our modules
@@ -16,8 +19,12 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 os.environ['REDIS_URL'] = ''
 
 from app import create_app
-from app.models import db, Users, Admin, Hospital_info, Hospital, BloodBank, Doctors_Info
+from app.models import (
+    db, Users, Admin, Hospital_info, Hospital, BloodBank, Doctors_Info, DoctorSchedule,
+    Emergency, Ambulance, AmbulanceStatus, Floor, Ward, Bed, BedStatus, Notification, Appointment
+)
 from app.utils.helpers import hash_password
+from sqlalchemy import create_engine, event
 from flask_jwt_extended import create_access_token
 
 
@@ -110,6 +117,24 @@ def auth_headers(app):
         }
 
 
+@pytest.fixture
+def query_counter(app):
+    """
+    Record every statement the app executes during the test.
+    Counts before cursor batching, which differs by dialect: SQLite runs a
+    bulk INSERT row by row where PostgreSQL sends a few multi-row INSERTs.
+    """
+    statements = []
+    
+    def record(conn, clauseelement, multiparams, params, execution_options):
+        statements.append(str(clauseelement))
+    
+    engine = db.engine
+    event.listen(engine, 'before_execute', record)
+    yield statements
+    event.remove(engine, 'before_execute', record)
+
+
 class TestMainRoutes:
     """Test main application routes"""
     
@@ -129,6 +154,16 @@ class TestMainRoutes:
         assert data['success'] is True
         assert 'endpoints' in data['data']
     
+    def test_constant_endpoints_not_modified(self, client):
+        """Test the welcome and info payloads revalidate with an empty 304"""
+        for path in ('/', '/api/info'):
+            response = client.get(path)
+            assert response.headers['ETag']
+            
+            cached = client.get(path, headers={'If-None-Match': response.headers['ETag']})
+            assert cached.status_code == 304
+            assert cached.data == b''
+    
     def test_health_check(self, client):
         """Test health check endpoint"""
         response = client.get('/health')
@@ -388,6 +423,147 @@ class TestHospitalRoutes:
         data = json.loads(response.data)
         assert data['success'] is True
     
+    def test_register_hospital_duplicates(self, client, auth_headers):
+        """Test duplicate username and email are reported by the UNIQUE constraints as 409"""
+        hospital_data = {
+            'username': 'test_hospital',
+            'name': 'Copy Hospital',
+            'type': 'General',
+            'email': 'copy@example.com',
+            'password': 'Hospital123!',
+            'location': 'Copy City'
+        }
+        response = client.post('/hospital/register', json=hospital_data, headers=auth_headers['admin'])
+        assert response.status_code == 409
+        assert json.loads(response.data)['message'] == 'Username already exists'
+        
+        hospital_data.update(username='copy_hospital', email='hospital@example.com')
+        response = client.post('/hospital/register', json=hospital_data, headers=auth_headers['admin'])
+        assert response.status_code == 409
+        assert json.loads(response.data)['message'] == 'Email already registered'
+    
+    def test_delete_hospital(self, client, auth_headers, app):
+        """Test deleting a hospital removes it, its login account and its floors, wards and beds"""
+        hospital_data = {
+            'username': 'gone_hospital',
+            'name': 'Gone Hospital',
+            'type': 'General',
+            'email': 'gone@example.com',
+            'password': 'Hospital123!',
+            'location': 'Gone City'
+        }
+        response = client.post('/hospital/register', json=hospital_data, headers=auth_headers['admin'])
+        info_id = json.loads(response.data)['data']['hospital']['id']
+        with app.app_context():
+            hospital_id = Hospital.query.filter_by(hospital_info_id=info_id).one().id
+            floor = Floor.query.filter_by(hospital_id=hospital_id).first() or Floor(floor_number='0', hospital_id=hospital_id)
+            db.session.add(Bed(bed_number='1', ward=Ward(ward_number='Z', capacity=1, floor=floor)))
+            db.session.commit()
+        
+        response = client.delete(f'/hospital/delete/{hospital_id}', headers=auth_headers['admin'])
+        assert response.status_code == 200
+        assert client.get(f'/hospital/{hospital_id}').status_code == 404
+        with app.app_context():
+            assert db.session.get(Hospital_info, info_id) is None
+            assert (Floor.query.count(), Ward.query.count(), Bed.query.count()) == (0, 0, 0)
+    
+    def test_delete_hospital_keeps_emergencies(self, client, auth_headers, app):
+        """Test deleting a hospital keeps its emergencies, unlinked by ON DELETE SET NULL"""
+        with app.app_context():
+            hospital = Hospital(name='Closing Hospital')
+            emergency = Emergency(emergency_type='Fire', location='Ward 3', contact_number='5550100', hospital=hospital)
+            db.session.add(emergency)
+            db.session.commit()
+            hospital_id, emergency_id = hospital.id, emergency.id
+        
+        response = client.delete(f'/hospital/delete/{hospital_id}', headers=auth_headers['admin'])
+        assert response.status_code == 200
+        with app.app_context():
+            assert db.session.get(Emergency, emergency_id).hospital_id is None
+    
+    def test_create_bed_duplicate(self, client, auth_headers, app):
+        """Test a repeated bed number in a ward answers 409"""
+        with app.app_context():
+            ward = Ward(ward_number='A', capacity=2, floor=Floor(floor_number='1', hospital=Hospital(name='Bed Hospital')))
+            db.session.add(ward)
+            db.session.commit()
+            ward_id = ward.id
+        
+        for expected_status in (201, 409):
+            response = client.post(f'/hospital/ward/{ward_id}/bed/create',
+                                   json={'bed_number': 'B1'},
+                                   headers=auth_headers['admin'])
+            assert response.status_code == expected_status
+    
+    def test_hospital_payload_validation(self, client, auth_headers, app):
+        """Test hospital, ward and bed payloads are checked before any write"""
+        with app.app_context():
+            ward = Ward(ward_number='A', capacity=2, floor=Floor(floor_number='1', hospital=Hospital(name='Schema Hospital')))
+            db.session.add(ward)
+            db.session.commit()
+            ward_id = ward.id
+        
+        headers = auth_headers['admin']
+        response = client.post('/hospital/register', json={'username': 'h'}, headers=headers)
+        assert response.status_code == 400
+        assert json.loads(response.data)['message'] == 'name is required'
+        
+        response = client.post(f'/hospital/ward/{ward_id}/bed/create', json={'bed_number': 7}, headers=headers)
+        assert response.status_code == 201
+        bed_id = json.loads(response.data)['data']['bed']['id']
+        
+        response = client.put(f'/hospital/bed/update/{bed_id}', json={'status': 'broken'}, headers=headers)
+        assert response.status_code == 400
+        assert json.loads(response.data)['message'].startswith('Invalid status')
+    
+    def test_ward_bed_counters(self, client, auth_headers, app):
+        """Test the ward bed counters follow bed inserts and status changes"""
+        with app.app_context():
+            ward = Ward(ward_number='A', capacity=2, floor=Floor(floor_number='1', hospital=Hospital(name='Counter Hospital')))
+            db.session.add(ward)
+            db.session.commit()
+            ward_id = ward.id
+        
+        headers = auth_headers['admin']
+        bed_ids = [
+            json.loads(client.post(f'/hospital/ward/{ward_id}/bed/create', json={'bed_number': number},
+                                   headers=headers).data)['data']['bed']['id']
+            for number in ('B1', 'B2')
+        ]
+        client.put(f'/hospital/bed/update/{bed_ids[0]}', json={'status': 'occupied'}, headers=headers)
+        client.put(f'/hospital/bed/update/{bed_ids[1]}', json={'status': 'maintenance'}, headers=headers)
+        
+        ward_data = json.loads(client.get(f'/hospital/ward/{ward_id}').data)['data']['ward']
+        assert (ward_data['bed_count'], ward_data['occupied_beds'], ward_data['available_beds']) == (2, 1, 0)
+    
+    def test_hospital_user_owns_wards_and_beds(self, client, auth_headers, app):
+        """Test hospital accounts can only add beds to and update beds in their own wards"""
+        with app.app_context():
+            own_ward = Ward(ward_number='A', capacity=2, floor=Floor(floor_number='0', hospital=Hospital(
+                name='Own Hospital', hospital_info_id=auth_headers['hospital_id']
+            )))
+            other_ward = Ward(ward_number='A', capacity=2, floor=Floor(floor_number='0', hospital=Hospital(name='Other Hospital')))
+            other_bed = Bed(bed_number='X', ward=other_ward)
+            db.session.add_all([own_ward, other_ward, other_bed])
+            db.session.commit()
+            own_ward_id, other_ward_id, other_bed_id = own_ward.id, other_ward.id, other_bed.id
+        
+        headers = auth_headers['hospital']
+        response = client.post(f'/hospital/ward/{own_ward_id}/bed/create', json={'bed_number': 'B1'}, headers=headers)
+        assert response.status_code == 201
+        bed_id = json.loads(response.data)['data']['bed']['id']
+        
+        response = client.put(f'/hospital/bed/update/{bed_id}', json={'status': 'occupied'}, headers=headers)
+        assert response.status_code == 200
+        assert json.loads(response.data)['data']['bed']['status'] == 'occupied'
+        
+        response = client.post(f'/hospital/ward/{other_ward_id}/bed/create', json={'bed_number': 'B1'}, headers=headers)
+        assert response.status_code == 403
+        response = client.put(f'/hospital/bed/update/{other_bed_id}', json={'status': 'occupied'}, headers=headers)
+        assert response.status_code == 403
+        response = client.post('/hospital/ward/9999/bed/create', json={'bed_number': 'B1'}, headers=headers)
+        assert response.status_code == 404
+    
     def test_get_all_hospitals(self, client):
         """Test get all hospitals"""
         response = client.get('/hospital/all')
@@ -396,6 +572,48 @@ class TestHospitalRoutes:
         assert data['success'] is True
         assert 'hospitals' in data['data']
     
+    def test_get_all_hospitals_info(self, client, auth_headers, app):
+        """Test the listing embeds hospital_info from the join, without the password"""
+        with app.app_context():
+            db.session.add_all([
+                Hospital(name='Linked Hospital', hospital_info_id=auth_headers['hospital_id']),
+                Hospital(name='Unlinked Hospital')
+            ])
+            db.session.commit()
+        
+        response = client.get('/hospital/all')
+        assert response.status_code == 200
+        hospitals = {h['name']: h for h in json.loads(response.data)['data']['hospitals']}
+        assert hospitals['Linked Hospital']['hospital_info']['username'] == 'test_hospital'
+        assert 'password' not in hospitals['Linked Hospital']['hospital_info']
+        assert 'hospital_info' not in hospitals['Unlinked Hospital']
+    
+    def test_get_all_hospitals_per_page_limit(self, client):
+        """Test per_page outside 1..100 is rejected"""
+        for per_page in ('0', '101', 'all'):
+            assert client.get(f'/hospital/all?per_page={per_page}').status_code == 400
+        assert client.get('/hospital/all?per_page=100').status_code == 200
+    
+    def test_get_all_hospitals_cursor(self, client, app):
+        """Test cursor pagination walks every hospital once in name order"""
+        with app.app_context():
+            for name in ['Hospital C', 'Hospital A', 'Hospital B', 'Hospital A']:
+                db.session.add(Hospital(name=name))
+            db.session.commit()
+        
+        names, cursor = [], ''
+        while cursor is not None:
+            response = client.get(f'/hospital/all?per_page=3&cursor={cursor}')
+            assert response.status_code == 200
+            data = json.loads(response.data)['data']
+            assert 'total' not in data['pagination']
+            names += [hospital['name'] for hospital in data['hospitals']]
+            cursor = data['pagination']['next_cursor']
+        assert names == ['Hospital A', 'Hospital A', 'Hospital B', 'Hospital C']
+        
+        response = client.get('/hospital/all?cursor=not-a-cursor')
+        assert response.status_code == 400
+    
     def test_get_hospital(self, client, auth_headers, app):
         """Test get specific hospital"""
         with app.app_context():
@@ -414,6 +632,50 @@ class TestHospitalRoutes:
             data = json.loads(response.data)
             assert data['success'] is True
             assert 'hospital' in data['data']
+    
+    def test_get_hospital_counts(self, client, app):
+        """Test hospital details count floors, wards and beds across the whole hospital"""
+        with app.app_context():
+            hospital = Hospital(name='Counted Hospital')
+            empty_floor = Floor(floor_number='0', hospital=hospital)
+            floor = Floor(floor_number='1', hospital=hospital)
+            ward_a = Ward(ward_number='A', capacity=4, floor=floor)
+            ward_b = Ward(ward_number='B', capacity=4, floor=floor)
+            beds = [Bed(bed_number=str(i), ward=ward_a) for i in range(3)]
+            db.session.add_all([hospital, empty_floor, floor, ward_a, ward_b, *beds])
+            db.session.commit()
+            hospital_id = hospital.id
+        
+        response = client.get(f'/hospital/{hospital_id}')
+        assert response.status_code == 200
+        hospital_data = json.loads(response.data)['data']['hospital']
+        assert hospital_data['floor_count'] == 2
+        assert hospital_data['total_wards'] == 2
+        assert hospital_data['total_beds'] == 3
+    
+    def test_get_hospital_floors_and_wards(self, client, app):
+        """Test floor, ward and bed listings read the loaded collections"""
+        with app.app_context():
+            hospital = Hospital(name='Layout Hospital')
+            upper = Floor(floor_number='2', hospital=hospital)
+            ground = Floor(floor_number='1', hospital=hospital)
+            ward = Ward(ward_number='A', capacity=4, floor=ground)
+            beds = [Bed(bed_number='B', ward=ward), Bed(bed_number='A', ward=ward, status=BedStatus.OCCUPIED)]
+            db.session.add_all([hospital, upper, ground, ward, *beds])
+            db.session.commit()
+            hospital_id, ward_id = hospital.id, ward.id
+        
+        floors = json.loads(client.get(f'/hospital/{hospital_id}/floors').data)['data']['floors']
+        assert [(f['floor_number'], f['ward_count']) for f in floors] == [('1', 1), ('2', 0)]
+        
+        wards = json.loads(client.get(f'/hospital/{hospital_id}/wards').data)['data']['wards']
+        assert [(w['ward_number'], w['bed_count']) for w in wards] == [('A', 2)]
+        
+        ward_data = json.loads(client.get(f'/hospital/ward/{ward_id}').data)['data']['ward']
+        assert (ward_data['bed_count'], ward_data['occupied_beds'], ward_data['available_beds']) == (2, 1, 1)
+        
+        beds = json.loads(client.get(f'/hospital/ward/{ward_id}/beds').data)['data']['beds']
+        assert [b['bed_number'] for b in beds] == ['A', 'B']
 
 
 class TestDoctorRoutes:
@@ -435,6 +697,29 @@ class TestDoctorRoutes:
         data = json.loads(response.data)
         assert data['success'] is True
     
+    def test_register_doctor_invalid(self, client, auth_headers):
+        """Test doctor registration rejects missing and malformed fields"""
+        for doctor_data, message in [
+            ({'mail': 'nameless@example.com'}, 'name is required'),
+            ({'name': 'Dr. Typo', 'mail': 'not-an-email'}, 'Invalid mail'),
+        ]:
+            response = client.post('/doctor/register',
+                                 data=json.dumps(doctor_data),
+                                 content_type='application/json',
+                                 headers=auth_headers['admin'])
+            assert response.status_code == 400
+            assert json.loads(response.data)['message'].startswith(message)
+    
+    def test_register_doctor_duplicate_email(self, client, auth_headers):
+        """Test registering a second doctor with the same email is rejected"""
+        doctor_data = {'name': 'Dr. Twin', 'mail': 'twin@example.com'}
+        for expected_status in (201, 409):
+            response = client.post('/doctor/register',
+                                 data=json.dumps(doctor_data),
+                                 content_type='application/json',
+                                 headers=auth_headers['admin'])
+            assert response.status_code == expected_status
+    
     def test_get_all_doctors(self, client):
         """Test get all doctors"""
         response = client.get('/doctor/all')
@@ -443,6 +728,75 @@ class TestDoctorRoutes:
         assert data['success'] is True
         assert 'doctors' in data['data']
     
+    def test_get_all_doctors_per_page_limit(self, client):
+        """Test per_page outside 1..100 is rejected"""
+        for per_page in ('0', '101', 'all'):
+            assert client.get(f'/doctor/all?per_page={per_page}').status_code == 400
+        assert client.get('/doctor/all?per_page=100').status_code == 200
+    
+    def test_get_all_doctors_etag(self, client):
+        """Test an unchanged roster revalidates with 304 and a new roster version changes the ETag"""
+        from app.services.cache_service import DoctorCache
+        
+        # Without Redis there is no cached roster version, so pages carry no ETag
+        response = client.get('/doctor/all')
+        assert response.status_code == 200
+        assert 'ETag' not in response.headers
+        
+        with patch.object(DoctorCache, 'get_roster_version', return_value='1:1'):
+            etag = client.get('/doctor/all').headers['ETag']
+            
+            response = client.get('/doctor/all', headers={'If-None-Match': etag})
+            assert response.status_code == 304
+            assert response.data == b''
+            
+            response = client.get('/doctor/all?page=2', headers={'If-None-Match': etag})
+            assert response.status_code == 200
+        
+        with patch.object(DoctorCache, 'get_roster_version', return_value='2:2'):
+            response = client.get('/doctor/all', headers={'If-None-Match': etag})
+            assert response.status_code == 200
+            assert response.headers['ETag'] != etag
+    
+    def test_get_all_doctors_cursor(self, client, app):
+        """Test cursor pagination walks every doctor once in name order"""
+        with app.app_context():
+            for i, name in enumerate(['Dr. C', 'Dr. A', 'Dr. B', 'Dr. A', 'Dr. D']):
+                db.session.add(Doctors_Info(name=name, mail=f'cursor{i}@example.com'))
+            db.session.commit()
+        
+        names, cursor = [], ''
+        while cursor is not None:
+            response = client.get(f'/doctor/all?per_page=2&cursor={cursor}')
+            assert response.status_code == 200
+            data = json.loads(response.data)['data']
+            assert 'total' not in data['pagination']
+            names += [doctor['name'] for doctor in data['doctors']]
+            cursor = data['pagination']['next_cursor']
+        assert names == ['Dr. A', 'Dr. A', 'Dr. B', 'Dr. C', 'Dr. D']
+        
+        response = client.get('/doctor/all?cursor=not-a-cursor')
+        assert response.status_code == 400
+    
+    def test_read_replica_routing(self, client, app):
+        """Test read-only handlers query the replica bind while writes stay on the primary"""
+        with app.app_context():
+            # Stand in for a SQLALCHEMY_BINDS['replica'] engine on this app only
+            replica = create_engine('sqlite://')
+            db.metadata.create_all(replica)
+            with replica.begin() as connection:
+                connection.execute(Doctors_Info.__table__.insert().values(name='Dr. Replica', mail='replica@example.com'))
+            db.engines['replica'] = replica
+            
+            try:
+                response = client.get('/doctor/all')
+                assert [d['name'] for d in json.loads(response.data)['data']['doctors']] == ['Dr. Replica']
+                assert Doctors_Info.query.count() == 0
+            finally:
+                db.session.remove()
+                db.engines.pop('replica')
+                replica.dispose()
+    
     def test_get_doctor(self, client, app):
         """Test get specific doctor"""
         with app.app_context():
@@ -459,6 +813,59 @@ class TestDoctorRoutes:
             data = json.loads(response.data)
             assert data['success'] is True
             assert 'doctor' in data['data']
+    
+    def test_get_doctor_hospitals(self, client, app):
+        """Test doctor details include the associated hospitals"""
+        with app.app_context():
+            doctor = Doctors_Info(name='Dr. Linked', mail='linked@example.com')
+            doctor.hospitals = [Hospital(name='North Clinic'), Hospital(name='South Clinic')]
+            db.session.add(doctor)
+            db.session.commit()
+            
+            response = client.get(f'/doctor/{doctor.id}')
+            assert response.status_code == 200
+            hospitals = json.loads(response.data)['data']['doctor']['hospitals']
+            assert sorted(h['name'] for h in hospitals) == ['North Clinic', 'South Clinic']
+    
+    def test_create_doctor_schedule(self, client, auth_headers, app):
+        """Test schedule creation checks the doctor and hospital exist"""
+        with app.app_context():
+            doctor = Doctors_Info(name='Dr. Shift', mail='shift@example.com')
+            hospital = Hospital(name='Shift Hospital')
+            db.session.add_all([doctor, hospital])
+            db.session.commit()
+            doctor_id, hospital_id = doctor.id, hospital.id
+        
+        for payload, expected_status in [
+            ({'doctor_id': doctor_id + 100, 'hospital_id': hospital_id}, 404),
+            ({'doctor_id': doctor_id, 'hospital_id': hospital_id + 100}, 404),
+            ({'doctor_id': doctor_id, 'hospital_id': hospital_id, 'day_of_week': 9}, 400),
+            ({'doctor_id': doctor_id, 'hospital_id': hospital_id, 'day_of_week': 2,
+              'start_time': '09:00', 'end_time': '13:30'}, 201)
+        ]:
+            response = client.post('/doctor/schedule',
+                                 data=json.dumps(payload),
+                                 content_type='application/json',
+                                 headers=auth_headers['admin'])
+            assert response.status_code == expected_status
+    
+    def test_get_doctor_schedule(self, client, app):
+        """Test doctor schedule includes each schedule's hospital"""
+        with app.app_context():
+            doctor = Doctors_Info(name='Dr. Rota', mail='rota@example.com')
+            hospital = Hospital(name='Rota Hospital')
+            doctor.schedules = [
+                DoctorSchedule(hospital=hospital, day_of_week=0),
+                DoctorSchedule(hospital=hospital, day_of_week=3)
+            ]
+            db.session.add(doctor)
+            db.session.commit()
+            
+            response = client.get(f'/doctor/{doctor.id}/schedule')
+            assert response.status_code == 200
+            schedules = json.loads(response.data)['data']['schedules']
+            assert len(schedules) == 2
+            assert all(s['hospital']['name'] == 'Rota Hospital' for s in schedules)
 
 
 class TestBloodBankRoutes:
@@ -480,6 +887,31 @@ class TestBloodBankRoutes:
         data = json.loads(response.data)
         assert data['success'] is True
     
+    def test_add_blood_stock(self, client, auth_headers, app):
+        """Test stock increments add up, via the JSON UPDATE and the fallback for other dialects"""
+        from app.routes import blood_bank
+        
+        response = client.post('/bloodbank/register', json={
+            'name': 'Stock Blood Bank',
+            'location': 'Stock City',
+            'contact_no': '1234567890',
+            'email': 'stock@example.com'
+        }, headers=auth_headers['admin'])
+        bloodbank_id = json.loads(response.data)['data']['blood_bank']['id']
+        
+        stock = {'blood_type': 'A+', 'units': 2}
+        assert client.post(f'/bloodbank/{bloodbank_id}/addstock', json=stock, headers=auth_headers['admin']).status_code == 200
+        with patch.dict(blood_bank._INCREMENT_STOCK_SQL, clear=True):
+            assert client.post(f'/bloodbank/{bloodbank_id}/addstock', json=stock, headers=auth_headers['admin']).status_code == 200
+            assert client.post('/bloodbank/9999/addstock', json=stock, headers=auth_headers['admin']).status_code == 404
+        
+        bad_stock = {'blood_type': 'A+"', 'units': 1}
+        assert client.post(f'/bloodbank/{bloodbank_id}/addstock', json=bad_stock, headers=auth_headers['admin']).status_code == 400
+        
+        with app.app_context():
+            bank = db.session.get(BloodBank, bloodbank_id)
+            assert (bank.stock_levels, bank.blood_types_available) == ({'A+': 4}, ['A+'])
+    
     def test_get_all_blood_banks(self, client):
         """Test get all blood banks"""
         response = client.get('/bloodbank/all')
@@ -512,6 +944,23 @@ class TestBloodBankRoutes:
         assert data['success'] is True
         assert 'requests' in data['data']
     
+    def test_export_blood_requests(self, client, auth_headers):
+        """Test streamed blood request export"""
+        response = client.get('/bloodbank/requests/export', headers=auth_headers['admin'])
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['success'] is True
+        assert data['data']['requests'] == []
+        
+        for blood_group in ('O+', 'AB-'):
+            client.post('/bloodbank/request', json={
+                'blood_group': blood_group, 'quantity_units': 1, 'location': 'Test City', 'reference': 'Export'
+            }, headers=auth_headers['user'])
+        
+        response = client.get('/bloodbank/requests/export', headers=auth_headers['admin'])
+        requests = json.loads(response.data)['data']['requests']
+        assert [blood_request['blood_group'] for blood_request in requests] == ['O+', 'AB-']
+    
     def test_get_blood_inventory(self, client, auth_headers):
         """Test get blood inventory"""
         response = client.get('/bloodbank/inventory', headers=auth_headers['admin'])
@@ -539,6 +988,37 @@ class TestEmergencyRoutes:
         data = json.loads(response.data)
         assert data['success'] is True
     
+    def test_log_emergency_inbox_without_redis(self, client, app):
+        """Test the emergency inbox falls back to a direct insert when Redis is down"""
+        app.config['EMERGENCY_INBOX_ENABLED'] = True
+        emergency_data = {
+            'emergency_type': 'Cardiac Arrest',
+            'location': 'Test Location',
+            'contact_number': '1234567890'
+        }
+        response = client.post('/emergency/call',
+                             data=json.dumps(emergency_data),
+                             content_type='application/json')
+        assert response.status_code == 201
+        assert json.loads(response.data)['data']['emergency']['id']
+    
+    def test_log_emergency_unknown_reference(self, client, auth_headers):
+        """Test a call naming a missing hospital or user is rejected before it is stored or queued"""
+        emergency_data = {
+            'emergency_type': 'Fire',
+            'location': 'Test Location',
+            'contact_number': '1234567890'
+        }
+        response = client.post('/emergency/call', json={**emergency_data, 'hospital_id': 9999})
+        assert response.status_code == 404
+        assert json.loads(response.data)['message'] == 'Hospital not found'
+        
+        response = client.post('/emergency/call', json={**emergency_data, 'user_id': 9999})
+        assert json.loads(response.data)['message'] == 'User not found'
+        
+        response = client.post('/emergency/call', json={**emergency_data, 'user_id': auth_headers['user_id']})
+        assert response.status_code == 201
+    
     def test_get_all_emergencies(self, client, auth_headers):
         """Test get all emergencies"""
         response = client.get('/emergency/all', headers=auth_headers['admin'])
@@ -547,6 +1027,69 @@ class TestEmergencyRoutes:
         assert data['success'] is True
         assert 'emergencies' in data['data']
     
+    def test_get_all_emergencies_per_page_limit(self, client, auth_headers):
+        """Test per_page outside 1..100 is rejected"""
+        for per_page in ('0', '101', 'all'):
+            response = client.get(f'/emergency/all?per_page={per_page}', headers=auth_headers['admin'])
+            assert response.status_code == 400
+        assert client.get('/emergency/all?per_page=100', headers=auth_headers['admin']).status_code == 200
+    
+    def test_get_all_emergencies_related(self, client, auth_headers, app):
+        """Test emergency listing includes hospital and user without the password"""
+        with app.app_context():
+            emergency = Emergency(
+                emergency_type='Accident',
+                location='Ring Road',
+                contact_number='1234567890',
+                hospital=Hospital(name='Trauma Centre'),
+                user_id=auth_headers['user_id']
+            )
+            db.session.add(emergency)
+            db.session.commit()
+        
+        response = client.get('/emergency/all', headers=auth_headers['admin'])
+        assert response.status_code == 200
+        [item] = json.loads(response.data)['data']['emergencies']
+        assert item['hospital']['name'] == 'Trauma Centre'
+        assert set(item['hospital']) == {'id', 'name', 'location', 'contact_num'}
+        assert item['user']['username'] == 'test_user'
+        assert 'password' not in item['user']
+    
+    def test_get_all_emergencies_cursor(self, client, auth_headers, app):
+        """Test cursor pagination returns emergencies newest first across pages"""
+        with app.app_context():
+            created = datetime(2024, 1, 1)
+            for i in range(5):
+                db.session.add(Emergency(
+                    emergency_type='Fire', location=f'Block {i}', contact_number='1234567890',
+                    created_at=created + timedelta(hours=i // 2)
+                ))
+            db.session.commit()
+        
+        locations, cursor = [], ''
+        while cursor is not None:
+            response = client.get(f'/emergency/all?per_page=2&cursor={cursor}',
+                                  headers=auth_headers['admin'])
+            assert response.status_code == 200
+            data = json.loads(response.data)['data']
+            locations += [emergency['location'] for emergency in data['emergencies']]
+            cursor = data['pagination']['next_cursor']
+        assert locations == ['Block 4', 'Block 3', 'Block 2', 'Block 1', 'Block 0']
+    
+    def test_get_all_emergencies_by_type(self, client, auth_headers, app):
+        """Test the type filter matches the emergency type exactly"""
+        with app.app_context():
+            for emergency_type in ['Fire', 'Forest Fire', 'Accident']:
+                db.session.add(Emergency(
+                    emergency_type=emergency_type, location='Test Location', contact_number='1234567890'
+                ))
+            db.session.commit()
+        
+        response = client.get('/emergency/all?type=Fire', headers=auth_headers['admin'])
+        assert response.status_code == 200
+        emergencies = json.loads(response.data)['data']['emergencies']
+        assert [e['emergency_type'] for e in emergencies] == ['Fire']
+    
     def test_get_emergency_stats(self, client, auth_headers):
         """Test get emergency statistics"""
         response = client.get('/emergency/stats', headers=auth_headers['admin'])
@@ -562,6 +1105,44 @@ class TestEmergencyRoutes:
         data = json.loads(response.data)
         assert data['success'] is True
         assert 'ambulances' in data['data']
+    
+    def test_get_available_ambulances_hospital(self, client, app):
+        """Test available ambulances include their hospital when they have one"""
+        with app.app_context():
+            db.session.add_all([
+                Ambulance(hospital=Hospital(name='Fleet Hospital'), driver_name='Hospital Driver'),
+                Ambulance(driver_name='Public Driver'),
+                Ambulance(status=AmbulanceStatus.OCCUPIED, driver_name='Busy Driver')
+            ])
+            db.session.commit()
+        
+        response = client.get('/emergency/ambulances/available')
+        assert response.status_code == 200
+        ambulances = {a['driver_name']: a for a in json.loads(response.data)['data']['ambulances']}
+        assert set(ambulances) == {'Hospital Driver', 'Public Driver'}
+        assert ambulances['Hospital Driver']['hospital']['name'] == 'Fleet Hospital'
+        assert 'hospital' not in ambulances['Public Driver']
+    
+    def test_ambulance_cache_invalidated_on_commit(self, app):
+        """Test fleet listings are invalidated after an ambulance write commits, not on flush or rollback"""
+        from app.services.cache_service import AmbulanceCache
+        
+        with patch.object(AmbulanceCache, 'invalidate_available') as invalidate:
+            db.session.add(Ambulance(driver_name='Rolled Back'))
+            db.session.flush()
+            db.session.rollback()
+            assert invalidate.call_count == 0
+            
+            ambulance = Ambulance(driver_name='Committed')
+            db.session.add(ambulance)
+            db.session.flush()
+            assert invalidate.call_count == 0
+            db.session.commit()
+            assert invalidate.call_count == 1
+            
+            db.session.add(Hospital(name='Not An Ambulance'))
+            db.session.commit()
+            assert invalidate.call_count == 1
 
 
 class TestAppointmentRoutes:
@@ -590,6 +1171,22 @@ class TestDashboardRoutes:
         assert response.status_code == 200
         data = json.loads(response.data)
         assert data['success'] is True
+    
+    def test_dashboard_recent_appointment_fields(self, client, auth_headers, app):
+        """Test the user dashboard lists recent appointments with only the dashboard fields"""
+        with app.app_context():
+            db.session.add(Appointment(appointment_type='opd', patient_id=auth_headers['user_id'], reason='Checkup'))
+            db.session.commit()
+        
+        response = client.get('/dashboard/', headers=auth_headers['user'])
+        assert response.status_code == 200
+        appointments = json.loads(response.data)['data']['recent_appointments']
+        assert len(appointments) == 1
+        assert set(appointments[0]) == {
+            'id', 'appointment_type', 'status', 'scheduled_time', 'reason',
+            'patient_id', 'doctor_id', 'hospital_id'
+        }
+        assert appointments[0]['reason'] == 'Checkup'
 
 
 class TestNotificationRoutes:
@@ -603,6 +1200,24 @@ class TestNotificationRoutes:
         assert data['success'] is True
         assert 'notifications' in data['data']
     
+    def test_get_my_notifications_unread_only(self, client, auth_headers, app):
+        """Test the listing returns the user's notifications newest first, optionally unread only"""
+        with app.app_context():
+            db.session.add_all([
+                Notification(user_id=auth_headers['user_id'], title='Old', body='Read', read=True,
+                             created_at=datetime(2024, 1, 1)),
+                Notification(user_id=auth_headers['user_id'], title='New', body='Unread', read=False,
+                             created_at=datetime(2024, 1, 2))
+            ])
+            db.session.commit()
+        
+        response = client.get('/notifications/my-notifications', headers=auth_headers['user'])
+        notifications = json.loads(response.data)['data']['notifications']
+        assert [(n['title'], n['read']) for n in notifications] == [('New', False), ('Old', True)]
+        
+        response = client.get('/notifications/my-notifications?unread_only=1', headers=auth_headers['user'])
+        assert [n['title'] for n in json.loads(response.data)['data']['notifications']] == ['New']
+    
     def test_get_unread_count(self, client, auth_headers):
         """Test get unread notification count"""
         response = client.get('/notifications/unread-count', headers=auth_headers['user'])
@@ -611,6 +1226,22 @@ class TestNotificationRoutes:
         assert data['success'] is True
         assert 'unread_count' in data['data']
     
+    def test_unread_count_seeds_with_generation(self, client, auth_headers):
+        """Test a counted unread total is seeded atomically against the generation read first"""
+        from unittest.mock import MagicMock
+        from app.services.cache_service import cache_service
+        
+        redis_client = MagicMock()
+        redis_client.mget.return_value = [None, b'3']
+        with patch.object(cache_service, 'redis_client', redis_client):
+            response = client.get('/notifications/unread-count', headers=auth_headers['user'])
+        assert json.loads(response.data)['data']['unread_count'] == 0
+        
+        # One script does the SET NX, and only while the generation is still 3
+        script, key_count, counter_key, generation_key, count, generation, ttl = redis_client.eval.call_args.args
+        assert (key_count, generation_key, count, generation) == (2, f'{counter_key}:gen', 0, 3)
+        redis_client.set.assert_not_called()
+    
     def test_mark_all_notifications_read(self, client, auth_headers):
         """Test mark all notifications as read"""
         response = client.post('/notifications/mark-all-read', headers=auth_headers['user'])
@@ -633,6 +1264,92 @@ class TestNotificationRoutes:
         data = json.loads(response.data)
         assert data['success'] is True
     
+    def test_send_notification_counts(self, client, auth_headers, app):
+        """Test unknown recipients are counted as failed and the rest are stored once each"""
+        response = client.post('/notifications/send', json={
+            'title': 'Counted',
+            'body': 'Counted notification',
+            'user_ids': [auth_headers['user_id'], 9999],
+            'metadata': {'source': 'test'}
+        }, headers=auth_headers['admin'])
+        data = json.loads(response.data)['data']
+        assert (data['sent_count'], data['failed_count']) == (1, 1)
+        
+        with app.app_context():
+            notifications = Notification.query.filter_by(title='Counted').all()
+            assert [(n.user_id, n.meta_info) for n in notifications] == [(auth_headers['user_id'], {'source': 'test'})]
+    
+    def test_send_notification_coerces_and_dedupes_ids(self, client, auth_headers, app):
+        """Test string ids are accepted, repeats are notified once and non-ids count as failed"""
+        user_id = auth_headers['user_id']
+        response = client.post('/notifications/send', json={
+            'title': 'Deduped',
+            'body': 'Deduped notification',
+            'user_ids': [user_id, str(user_id), user_id, 'not-an-id']
+        }, headers=auth_headers['admin'])
+        data = json.loads(response.data)['data']
+        assert (data['sent_count'], data['failed_count'], data['total_requested']) == (1, 1, 2)
+        
+        with app.app_context():
+            assert Notification.query.filter_by(title='Deduped').count() == 1
+    
+    def test_send_notification_query_budget(self, client, auth_headers, app, query_counter):
+        """Test sending or broadcasting to many users costs the same queries as sending to one"""
+        with app.app_context():
+            users = [
+                Users(username=f'budget_{i}', fullname=f'Budget {i}', email=f'budget_{i}@example.com',
+                      password='not-a-hash', role='user')
+                for i in range(200)
+            ]
+            db.session.add_all(users)
+            db.session.commit()
+            user_ids = [user.id for user in users]
+        
+        def send(ids):
+            query_counter.clear()
+            response = client.post('/notifications/send', json={
+                'title': 'Budget', 'body': 'Query budget', 'user_ids': ids
+            }, headers=auth_headers['admin'])
+            assert json.loads(response.data)['data']['sent_count'] == len(ids)
+            return len(query_counter)
+        
+        single = send(user_ids[:1])
+        assert single <= 3
+        assert send(user_ids) == single
+        
+        query_counter.clear()
+        client.post('/notifications/broadcast', json={
+            'title': 'Budget', 'body': 'Query budget', 'target_roles': ['user']
+        }, headers=auth_headers['admin'])
+        assert len(query_counter) == single
+    
+    def test_get_my_notifications_query_budget(self, client, auth_headers, query_counter):
+        """Test listing notifications runs a fixed number of queries"""
+        for _ in range(5):
+            client.post('/notifications/send', json={
+                'title': 'Listed', 'body': 'Listed notification', 'user_ids': [auth_headers['user_id']]
+            }, headers=auth_headers['admin'])
+        
+        query_counter.clear()
+        response = client.get('/notifications/my-notifications', headers=auth_headers['user'])
+        assert json.loads(response.data)['data']['pagination']['total'] == 5
+        assert len(query_counter) <= 3
+    
+    def test_send_template_notification(self, client, auth_headers, app):
+        """Test a template send formats the template and records it in the metadata"""
+        response = client.post('/notifications/send-template', json={
+            'template_id': 'password_expiry',
+            'user_ids': [auth_headers['user_id']],
+            'variables': {'days': 3}
+        }, headers=auth_headers['admin'])
+        assert response.status_code == 200
+        assert json.loads(response.data)['data']['sent_count'] == 1
+        
+        with app.app_context():
+            notification = Notification.query.filter_by(title='Password Expires Soon').one()
+            assert notification.body.startswith('Your password will expire in 3 days')
+            assert notification.meta_info == {'template_id': 'password_expiry', 'variables': {'days': 3}}
+    
     def test_get_notification_templates(self, client, auth_headers):
         """Test get notification templates"""
         response = client.get('/notifications/templates', headers=auth_headers['admin'])
@@ -787,6 +1504,43 @@ class TestDocsRoutes:
         data = json.loads(response.data)
         assert data['success'] is True
         assert 'available_endpoints' in data['data']
+    
+    def test_api_docs_precompressed(self, client):
+        """Test API documentation page is served gzipped and revalidates"""
+        response = client.get('/api-docs', headers={'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert b'Hospital Management System' in gzip.decompress(response.data)
+        assert "script-src 'self'" in response.headers['Content-Security-Policy']
+        assert 'rel=preload; as=style' in response.headers['Link']
+        
+        cached = client.get('/api-docs', headers={
+            'Accept-Encoding': 'gzip',
+            'If-None-Match': response.headers['ETag']
+        })
+        assert cached.status_code == 304
+    
+    def test_api_test_not_modified(self, client):
+        """Test API testing interface revalidates against its ETag"""
+        response = client.get('/api-test')
+        assert response.status_code == 200
+        assert response.headers['ETag']
+        
+        cached = client.get('/api-test', headers={'If-None-Match': response.headers['ETag']})
+        assert cached.status_code == 304
+        assert cached.data == b''
+    
+    def test_api_docs_assets(self, client):
+        """Test API documentation CSS/JS are linked by hash and cached for good"""
+        page = client.get('/api-docs').get_data(as_text=True)
+        asset_urls = set(re.findall(r'/api-docs/assets/api-docs\.\w+\.(?:css|js)', page))
+        assert len(asset_urls) == 2
+        
+        for url in asset_urls:
+            response = client.get(url)
+            assert response.status_code == 200
+            assert 'immutable' in response.headers['Cache-Control']
 
 
 class TestSwaggerRoutes:
@@ -807,6 +1561,63 @@ class TestSwaggerRoutes:
         assert 'info' in data
 
 
+class TestHelpers:
+    """Test shared helper utilities"""
+    
+    def test_serialize_model(self, app):
+        """Test serialize_model honours fields/exclude and formats values"""
+        from datetime import date
+        from app.models import BloodInventory
+        from app.utils.helpers import serialize_model
+        
+        inventory = BloodInventory(bloodbank_id=1, blood_type='A+', units=2, expiry_date=date(2025, 1, 2))
+        data = serialize_model(inventory)
+        assert data['expiry_date'] == '2025-01-02'
+        assert data['units'] == 2
+        
+        assert serialize_model(inventory, fields=['id', 'blood_type']) == {'id': None, 'blood_type': 'A+'}
+        assert 'units' not in serialize_model(inventory, exclude=['units'])
+        
+        user = Users(username='u', fullname='U', email='u@example.com', password='x')
+        assert 'password' not in serialize_model(user, exclude=['password'])
+    
+    def test_success_response_embeds_fragment(self, app):
+        """Test cached JSON passed as an orjson.Fragment is embedded in the envelope as-is"""
+        import orjson
+        from app.utils.helpers import create_success_response
+        
+        payload, _ = create_success_response('Cached', orjson.Fragment(b'{"items":[1,2]}'))
+        assert app.json.response(payload).get_json() == {
+            'success': True, 'message': 'Cached', 'data': {'items': [1, 2]}
+        }
+    
+    def test_cached_json_matches_provider(self, app):
+        """Test a cached payload is stored as the JSON provider would send it, sorted keys included"""
+        from unittest.mock import MagicMock
+        from app.services.cache_service import DoctorCache, cache_service
+        
+        data = {'total': 1, 'doctors': [{'name': 'Dr. Ré', 'id': 7}]}
+        with patch.object(cache_service, 'redis_client', MagicMock()) as redis_client:
+            assert DoctorCache.set_doctor_list(1, 'page=1', data)
+            stored = redis_client.setex.call_args.args[2]
+        assert stored.encode('utf-8') == app.json.dumps(data).encode('utf-8')
+    
+    def test_prebuilt_response_matches_provider(self, app):
+        """Test a prebuilt constant body is the same bytes the JSON provider sends"""
+        from app.utils.helpers import create_success_response, prebuilt_success_response
+        
+        data = {'name': 'Hôpital', 'ids': [2, 1], 'codes': {1: 'one'}}
+        body, _ = prebuilt_success_response('Constant', data)
+        payload, _ = create_success_response('Constant', data)
+        assert body == app.json.response(payload).get_data()
+    
+    def test_orjson_provider_output(self, app):
+        """Test where the orjson provider's output differs from Flask's default provider"""
+        assert app.json.dumps({
+            'name': 'Hôpital', 'ratio': 1.5, 'missing': float('nan'), 'when': datetime(2024, 1, 2, 3, 4, 5)
+        }) == '{"missing":null,"name":"Hôpital","ratio":1.5,"when":"Tue, 02 Jan 2024 03:04:05 GMT"}'
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
     
\ No newline at end of file